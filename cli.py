@@ -124,7 +124,8 @@ class CLI:
             
             print("\nMigration completed!")
             print(f"Total time: {duration:.2f} seconds")
-            print(f"Collections: {stats['successful_collections']} successful, {stats['failed_collections']} failed")
+            print(f"Collections: {stats['successful_collections']} successful, {stats['failed_collections']} failed, "
+                  f"{stats.get('cancelled_collections', 0)} cancelled")
             print(f"Documents: {stats['migrated_documents']} migrated, {stats['failed_documents']} failed")
             
             # Ask if user wants to set up change streams
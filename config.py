@@ -4,6 +4,7 @@ Configuration module for Azure Cosmos DB MongoDB Migration Tool.
 
 import os
 import logging
+from bson import json_util
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
@@ -20,11 +21,21 @@ class Config:
         # PostgreSQL connection settings
         self.pg_source_connection_string = None
         self.pg_dest_connection_string = None
+        self.pg_pool_min = 5  # Connections opened up front per PostgreSQL pool
+        self.pg_pool_max = None  # Upper bound per PostgreSQL pool; None sizes it from migration_workers
+        # Server-side session settings sent at connect; set empty when going through PgBouncer
+        self.pg_session_options = "-c statement_timeout=0 -c idle_in_transaction_session_timeout=600000"
+        self.pg_bulk_mode = False  # Relax commit durability on the destination during data loads
+        self.pg_unlogged_load = False  # Load into UNLOGGED tables, switched back to LOGGED afterwards
         
         # General settings
         self.use_managed_identity = False
         self.batch_size = 1000
+        self.migration_workers = 4  # Parallel write workers per collection
         self.timeout_ms = 30000
+        self.mongo_compressors = "zstd,snappy,zlib"  # Wire compression, in order of preference
+        self.projection = None  # Source find() projection; None migrates whole documents
+        self.query_filter = None  # Source find() filter, e.g. {"_ts": {"$gt": 1700000000}} for incremental runs
         
         # Enhanced retry settings
         self.retry_attempts = 3
@@ -54,13 +65,27 @@ class Config:
             # PostgreSQL connection strings
             self.pg_source_connection_string = os.getenv("PG_SOURCE_CONNECTION_STRING")
             self.pg_dest_connection_string = os.getenv("PG_DEST_CONNECTION_STRING")
+            self.pg_pool_min = int(os.getenv("PG_POOL_MIN", "5"))
+            pg_pool_max = os.getenv("PG_POOL_MAX")
+            self.pg_pool_max = int(pg_pool_max) if pg_pool_max else None
+            self.pg_session_options = os.getenv("PG_SESSION_OPTIONS", self.pg_session_options)
+            self.pg_bulk_mode = os.getenv("PG_BULK_MODE", "False").lower() == "true"
+            self.pg_unlogged_load = os.getenv("PG_UNLOGGED_LOAD", "False").lower() == "true"
             
             # Check if managed identity should be used
             self.use_managed_identity = os.getenv("USE_MANAGED_IDENTITY", "False").lower() == "true"
             
             # Performance settings
             self.batch_size = int(os.getenv("BATCH_SIZE", "1000"))
+            self.migration_workers = int(os.getenv("MIGRATION_WORKERS", "4"))
             self.timeout_ms = int(os.getenv("TIMEOUT_MS", "30000"))
+            self.mongo_compressors = os.getenv("MONGO_COMPRESSORS", "zstd,snappy,zlib")
+            
+            # Source query pushdown (MongoDB Extended JSON)
+            projection = os.getenv("MIGRATION_PROJECTION")
+            self.projection = json_util.loads(projection) if projection else None
+            query_filter = os.getenv("MIGRATION_QUERY_FILTER")
+            self.query_filter = json_util.loads(query_filter) if query_filter else None
             
             # Enhanced retry settings
             self.retry_attempts = int(os.getenv("RETRY_ATTEMPTS", "3"))
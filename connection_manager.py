@@ -4,8 +4,10 @@ Implements connection retry logic with exponential backoff and health monitoring
 """
 
 import logging
+import random
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError, PyMongoError
 from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
@@ -25,10 +27,10 @@ class ConnectionManager:
         self.config = config
         self.source_client = None
         self.dest_client = None
-        self._source_healthy = False
-        self._dest_healthy = False
-        self._health_check_lock = threading.Lock()
-        self._shutdown_requested = False
+        # Set while the connection is healthy; Event reads need no lock
+        self._source_healthy_evt = threading.Event()
+        self._dest_healthy_evt = threading.Event()
+        self._shutdown_evt = threading.Event()
         
         # Start health monitoring thread
         self._health_monitor_thread = threading.Thread(target=self._health_monitor, daemon=True)
@@ -36,36 +38,56 @@ class ConnectionManager:
         
     def _health_monitor(self):
         """Background health monitoring for connections."""
-        while not self._shutdown_requested:
-            try:
-                # Check source connection health
-                if self.source_client:
-                    try:
-                        self.source_client.admin.command('ping')
-                        with self._health_check_lock:
-                            self._source_healthy = True
-                    except Exception as e:
-                        logger.warning(f"Source connection health check failed: {e}")
-                        with self._health_check_lock:
-                            self._source_healthy = False
-                
-                # Check destination connection health
-                if self.dest_client:
-                    try:
-                        self.dest_client.admin.command('ping')
-                        with self._health_check_lock:
-                            self._dest_healthy = True
-                    except Exception as e:
-                        logger.warning(f"Destination connection health check failed: {e}")
-                        with self._health_check_lock:
-                            self._dest_healthy = False
-                
-                # Sleep for configured interval before next health check
-                time.sleep(self.config.health_check_interval_seconds)
-                
-            except Exception as e:
-                logger.error(f"Error in health monitoring: {e}")
-                time.sleep(self.config.health_check_interval_seconds)
+        # Source and destination are pinged concurrently so a slow server can't
+        # delay the other side's health update
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="mongo-health") as pinger:
+            while not self._shutdown_evt.is_set():
+                interval = self.config.health_check_interval_seconds
+                try:
+                    checks = [
+                        (event, pinger.submit(self._ping, client, label))
+                        for event, client, label in (
+                            (self._source_healthy_evt, self.source_client, "Source"),
+                            (self._dest_healthy_evt, self.dest_client, "Destination"),
+                        )
+                        if client
+                    ]
+                    for event, future in checks:
+                        self._set_health(event, future.result())
+                    
+                except Exception as e:
+                    logger.error(f"Error in health monitoring: {e}")
+                    
+                # Wait for configured interval before next health check, jittered so managers
+                # created together don't ping in lockstep; returns early on shutdown
+                if self._shutdown_evt.wait(interval + random.random() * interval * 0.1):
+                    break
+            
+    @staticmethod
+    def _set_health(event, healthy):
+        """Publish a health result on a health event."""
+        if healthy:
+            event.set()
+        else:
+            event.clear()
+            
+    @staticmethod
+    def _ping(client, label):
+        """Ping a MongoDB client for the health monitor.
+        
+        Args:
+            client: MongoClient to ping
+            label: "Source" or "Destination", for logging
+            
+        Returns:
+            bool: True if the server answered
+        """
+        try:
+            client.admin.command('ping')
+            return True
+        except Exception as e:
+            logger.warning(f"{label} connection health check failed: {e}")
+            return False
                 
     def is_source_healthy(self):
         """Check if source connection is healthy.
@@ -73,8 +95,7 @@ class ConnectionManager:
         Returns:
             bool: True if source connection is healthy
         """
-        with self._health_check_lock:
-            return self._source_healthy
+        return self._source_healthy_evt.is_set()
             
     def is_dest_healthy(self):
         """Check if destination connection is healthy.
@@ -82,8 +103,7 @@ class ConnectionManager:
         Returns:
             bool: True if destination connection is healthy
         """
-        with self._health_check_lock:
-            return self._dest_healthy
+        return self._dest_healthy_evt.is_set()
         
     def connect_to_source(self, retry_on_failure=True):
         """Connect to the source MongoDB instance with retry logic.
@@ -126,8 +146,7 @@ class ConnectionManager:
                 self.source_client = self._create_mongo_client_with_retry(connection_string, "source")
                 
             # Mark as healthy after successful connection
-            with self._health_check_lock:
-                self._source_healthy = True
+            self._source_healthy_evt.set()
                 
             logger.info("Successfully connected to source MongoDB instance")
             return self.source_client
@@ -135,8 +154,7 @@ class ConnectionManager:
         except Exception as e:
             logger.error(f"Failed to connect to source MongoDB instance: {e}")
             self.source_client = None
-            with self._health_check_lock:
-                self._source_healthy = False
+            self._source_healthy_evt.clear()
             return None
             
     def connect_to_destination(self, retry_on_failure=True):
@@ -180,8 +198,7 @@ class ConnectionManager:
                 self.dest_client = self._create_mongo_client_with_retry(connection_string, "destination")
                 
             # Mark as healthy after successful connection
-            with self._health_check_lock:
-                self._dest_healthy = True
+            self._dest_healthy_evt.set()
                 
             logger.info("Successfully connected to destination MongoDB instance")
             return self.dest_client
@@ -189,8 +206,7 @@ class ConnectionManager:
         except Exception as e:
             logger.error(f"Failed to connect to destination MongoDB instance: {e}")
             self.dest_client = None
-            with self._health_check_lock:
-                self._dest_healthy = False
+            self._dest_healthy_evt.clear()
             return None
     
     def _create_mongo_client_with_retry(self, connection_string, client_type="unknown"):
@@ -225,6 +241,9 @@ class ConnectionManager:
                     retryWrites=True,
                     retryReads=True,
                     heartbeatFrequencyMS=10000,  # Health check every 10 seconds
+                    # Wire compression; pymongo skips codecs whose library isn't installed
+                    compressors=self.config.mongo_compressors or [],
+                    zlibCompressionLevel=6,
                 )
                 
                 # Test connection with ping command
@@ -313,15 +332,14 @@ class ConnectionManager:
         """Close all active connections and stop health monitoring."""
         logger.info("Closing all connections...")
         
-        # Stop health monitoring
-        self._shutdown_requested = True
+        # Stop health monitoring (wakes the monitor out of its interval wait)
+        self._shutdown_evt.set()
         
         if self.source_client:
             try:
                 logger.info("Closing source connection")
                 self.source_client.close()
-                with self._health_check_lock:
-                    self._source_healthy = False
+                self._source_healthy_evt.clear()
             except Exception as e:
                 logger.warning(f"Error closing source connection: {e}")
             finally:
@@ -331,8 +349,7 @@ class ConnectionManager:
             try:
                 logger.info("Closing destination connection")
                 self.dest_client.close()
-                with self._health_check_lock:
-                    self._dest_healthy = False
+                self._dest_healthy_evt.clear()
             except Exception as e:
                 logger.warning(f"Error closing destination connection: {e}")
             finally:
@@ -9,9 +9,11 @@ import queue
 import logging
 import json
 import os
+import re
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 import sys
+import signal
 
 # Import the existing components
 try:
@@ -31,18 +33,74 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# libpq keyword/value connection string, filled in by build_postgresql_connection_string
+_PG_DSN_TEMPLATE = "host={host} port={port} dbname={dbname} user={user} password={password}{ssl}".format
+_AZURE_PG_HOST_SUFFIX = ".postgres.database.azure.com"
+
+# (matcher, required message, invalid message) per field checked by
+# validate_postgresql_connection_fields; a None matcher means required only
+_PG_FIELD_RULES = tuple(
+    (matcher, f"{label} is required", f"{label} contains invalid characters")
+    for label, matcher in (
+        ("Server URL", re.compile(r"\A(?:postgres(?:ql)?://)?[A-Za-z0-9.\-:\[\]]+/?\Z").match),
+        ("Database name", re.compile(r"\A[A-Za-z0-9_][A-Za-z0-9_.-]*\Z").match),
+        ("Username", None),
+        ("Password", None),
+    )
+)
+
+
+def _pg_dsn_value(value):
+    """Quote a libpq connection string value when it contains spaces, quotes or backslashes."""
+    if value and not any(c in value for c in " '\\"):
+        return value
+    escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+class _FieldVar:
+    """Plain stand-in for tk.StringVar with the same get/set API, used when running headless."""
+    
+    __slots__ = ("value",)
+    
+    def __init__(self, value=""):
+        self.value = value
+        
+    def get(self):
+        return self.value
+        
+    def set(self, value):
+        self.value = value
+
+
 class CosmosDBMigrationGUI:
     """Modern Windows GUI for Cosmos DB MongoDB Migration Tool."""
     
-    def __init__(self):
-        """Initialize the GUI application."""
-        self.root = tk.Tk()
-        self.root.title("Azure Cosmos DB MongoDB Migration Tool")
-        self.root.geometry("1200x800")
-        self.root.minsize(1000, 600)
-        
-        # Configure modern styling
-        self.setup_styles()
+    # PostgreSQL connection field variables, the only state a headless instance needs
+    PG_FIELD_VARS = (
+        "pg_source_server_var", "pg_source_db_var", "pg_source_user_var", "pg_source_pass_var",
+        "pg_dest_server_var", "pg_dest_db_var", "pg_dest_user_var", "pg_dest_pass_var",
+    )
+    
+    def __init__(self, headless=False):
+        """Initialize the GUI application.
+        
+        Args:
+            headless: Skip Tk entirely and create only the PostgreSQL connection field
+                variables as plain Python objects (for scripts that exercise the
+                connection logic without showing the UI); root is None in this mode
+        """
+        self.headless = headless
+        if headless:
+            self.root = None
+        else:
+            self.root = tk.Tk()
+            self.root.title("Azure Cosmos DB MongoDB Migration Tool")
+            self.root.geometry("1200x800")
+            self.root.minsize(1000, 600)
+            
+            # Configure modern styling
+            self.setup_styles()
         
         # Initialize application state
         self.config = None
@@ -70,13 +128,20 @@ class CosmosDBMigrationGUI:
         # Threading for background operations
         self.task_queue = queue.Queue()
         self.result_queue = queue.Queue()
+        self._log_queue = queue.Queue(maxsize=10000)  # Migration log lines awaiting display
         
+        if headless:
+            for name in self.PG_FIELD_VARS:
+                setattr(self, name, _FieldVar())
+            return
+            
         # Create the main interface
         self.create_widgets()
         self.setup_logging_handler()
         
-        # Start the result processor
+        # Start the result processor and migration log drain
         self.process_results()
+        self._drain_log_queue()
         
     def setup_styles(self):
         """Configure modern styling for the application."""
@@ -335,16 +400,19 @@ class CosmosDBMigrationGUI:
         self.collections_tree.column('Size', width=100)
         
         # Scrollbar for collections tree
-        coll_scrollbar = ttk.Scrollbar(coll_frame, orient='vertical', command=self.collections_tree.yview)
-        self.collections_tree.configure(yscrollcommand=coll_scrollbar.set)
+        self.collections_scrollbar = ttk.Scrollbar(coll_frame, orient='vertical', command=self.collections_tree.yview)
+        self.collections_tree.configure(yscrollcommand=self._on_collections_yscroll)
         
         self.collections_tree.pack(side='left', fill='both', expand=True)
-        coll_scrollbar.pack(side='right', fill='y')
+        self.collections_scrollbar.pack(side='right', fill='y')
         
         # Bind click event for collection selection
         self.collections_tree.bind('<Button-1>', self.on_collection_click)
         self.collections_tree.bind('<space>', self.on_collection_space)
         
+        # Load document counts only for rows scrolled into view
+        self.collections_tree.bind('<Configure>', self._on_tree_scroll)
+        
         # Collection selection controls
         coll_controls_frame = ttk.Frame(coll_frame)
         coll_controls_frame.pack(fill='x', pady=(10, 0))
@@ -354,7 +422,7 @@ class CosmosDBMigrationGUI:
         ttk.Button(coll_controls_frame, text="Select None", 
                   command=self.select_no_collections).pack(side='left', padx=(0, 10))
         ttk.Button(coll_controls_frame, text="Refresh Collections", 
-                  command=self.refresh_collections).pack(side='left')
+                  command=lambda: self.refresh_collections(force=True)).pack(side='left')
         
         # Selected collections summary
         self.selected_summary_var = tk.StringVar(value="No collections selected")
@@ -459,7 +527,11 @@ class CosmosDBMigrationGUI:
         
         # Track selected collections
         self.selected_collections = set()
+        self._selected_count = 0  # len(selected_collections), maintained incrementally
         self.collection_data = {}  # Store collection metadata
+        self._pending_count_loads = set()  # Rows with a count lookup in flight
+        self._visible_load_scheduled = False
+        self._count_cache_force = False
     
     def create_postgresql_tab(self):
         """Create the PostgreSQL migration tab."""
@@ -706,6 +778,10 @@ class CosmosDBMigrationGUI:
                         self.update_database_list(data)
                     elif result_type == 'migration_progress':
                         self.update_migration_progress(data)
+                    elif result_type == 'collection_count':
+                        self.update_collection_count(*data)
+                    elif result_type == 'collection_count_failed':
+                        self._pending_count_loads.discard(data)
 
                     elif result_type == 'error':
                         messagebox.showerror("Error", data)
@@ -819,12 +895,12 @@ class CosmosDBMigrationGUI:
                 db_data = []
                 
                 for db_name in databases:
-                    collections = self.migration_service.list_collections(db_name)
+                    collections = self.migration_service.list_collections(db_name, force=True)
                     total_docs = 0
                     
                     coll_data = []
                     for coll_name in collections:
-                        doc_count = self.migration_service.count_documents(db_name, coll_name)
+                        doc_count = self.migration_service.get_collection_count(db_name, coll_name, force=True)
                         total_docs += doc_count
                         coll_data.append({
                             'name': coll_name,
@@ -891,7 +967,9 @@ class CosmosDBMigrationGUI:
                 if not self.destination_client:
                     raise Exception("Failed to connect to destination database")
                     
-                # Initialize migration service
+                # Initialize migration service, retiring the one from a previous connect
+                if self.migration_service:
+                    self.migration_service.close()
                 self.migration_service = MigrationService(
                     self.source_client, 
                     self.destination_client, 
@@ -1285,6 +1363,7 @@ class CosmosDBMigrationGUI:
                 
         # Initialize migration state
         self._migration_stopped = False
+        self.migration_service.cancel_event.clear()
         
         # Start migration in background
         threading.Thread(target=migration_task, daemon=True).start()
@@ -1354,6 +1433,9 @@ class CosmosDBMigrationGUI:
         """Stop the ongoing migration."""
         if hasattr(self, '_migration_stopped'):
             self._migration_stopped = True
+            if self.migration_service:
+                # Also stops the batch workers inside the running collection
+                self.migration_service.cancel_event.set()
             self.log_migration_message('Stopping migration...', "WARNING")
             self.stop_migration_btn.configure(state='disabled')
 
@@ -1406,6 +1488,66 @@ class CosmosDBMigrationGUI:
         self.log_message(f"Log level changed to {level}", "INFO")
 
     # PostgreSQL Methods
+    @staticmethod
+    def validate_postgresql_connection_fields(server, database, username, password):
+        """Validate the individual PostgreSQL connection fields.
+        
+        Args:
+            server: Server host, optionally with a postgresql:// prefix and a :port suffix
+            database: Database name
+            username: User name
+            password: Password
+            
+        Returns:
+            list: Error messages, empty if all fields are valid
+        """
+        errors = []
+        for (matches, required_msg, invalid_msg), value in zip(_PG_FIELD_RULES, (server, database, username, password)):
+            if not value:
+                errors.append(required_msg)
+            elif matches and not matches(value):
+                errors.append(invalid_msg)
+        return errors
+        
+    @staticmethod
+    def build_postgresql_connection_string(server, database, username, password):
+        """Build a libpq connection string from the individual connection fields.
+        
+        Args:
+            server: Server host, optionally with a postgresql:// prefix and a :port suffix
+            database: Database name
+            username: User name
+            password: Password
+            
+        Returns:
+            tuple: (connection string, the same string with the password masked for display);
+                Azure Database for PostgreSQL hosts get sslmode=require
+            
+        Raises:
+            ValueError: If a field is empty or the port is not a number
+        """
+        if not (server and database and username and password):
+            raise ValueError("Server, database, username and password are all required")
+            
+        host = server.split("://", 1)[-1].rstrip("/")
+        if host.startswith("["):  # [ipv6] or [ipv6]:port
+            host, _, port = host[1:].partition("]")
+            port = port.lstrip(":")
+        elif host.count(":") == 1:  # host:port
+            host, _, port = host.partition(":")
+        else:
+            port = ""
+        if port and not port.isdigit():
+            raise ValueError(f"Invalid port in server URL: {server}")
+        port = port or "5432"
+            
+        ssl = " sslmode=require" if host.lower().endswith(_AZURE_PG_HOST_SUFFIX) else ""
+        fields = dict(host=host, port=port, dbname=_pg_dsn_value(database), user=_pg_dsn_value(username), ssl=ssl)
+        return (
+            _PG_DSN_TEMPLATE(password=_pg_dsn_value(password), **fields),
+            _PG_DSN_TEMPLATE(password="*" * len(password), **fields)
+        )
+
     def test_postgresql_connections(self):
         """Test PostgreSQL connections with the provided credentials."""
         try:
@@ -1442,10 +1584,10 @@ class CosmosDBMigrationGUI:
             
             # Build connection strings
             try:
-                source_conn_str = self.build_postgresql_connection_string(
+                source_conn_str, _ = self.build_postgresql_connection_string(
                     source_server, source_db, source_user, source_pass
                 )
-                dest_conn_str = self.build_postgresql_connection_string(
+                dest_conn_str, _ = self.build_postgresql_connection_string(
                     dest_server, dest_db, dest_user, dest_pass
                 )
             except ValueError as e:
@@ -1461,7 +1603,7 @@ class CosmosDBMigrationGUI:
                         except ImportError:
                             from config import Config
                         self.config = Config()
-                        self.pg_connection_manager = PostgreSQLConnectionManager(self.config)
+                        self.pg_connection_manager = PostgreSQLConnectionManager(self.config, interactive=False)
                     
                     # Test source connection
                     self.log_message("Testing source PostgreSQL connection...", "INFO")
@@ -1542,10 +1684,10 @@ class CosmosDBMigrationGUI:
             
             # Build connection strings
             try:
-                source_conn_str = self.build_postgresql_connection_string(
+                source_conn_str, _ = self.build_postgresql_connection_string(
                     source_server, source_db, source_user, source_pass
                 )
-                dest_conn_str = self.build_postgresql_connection_string(
+                dest_conn_str, _ = self.build_postgresql_connection_string(
                     dest_server, dest_db, dest_user, dest_pass
                 )
             except ValueError as e:
@@ -1561,7 +1703,7 @@ class CosmosDBMigrationGUI:
                         except ImportError:
                             from config import Config
                         self.config = Config()
-                        self.pg_connection_manager = PostgreSQLConnectionManager(self.config)
+                        self.pg_connection_manager = PostgreSQLConnectionManager(self.config, interactive=False)
                     
                     if not self.pg_migration_service:
                         self.pg_migration_service = PostgreSQLMigrationService(self.pg_connection_manager)
@@ -1656,10 +1798,28 @@ class CosmosDBMigrationGUI:
         pass
 
     def log_migration_message(self, message, level="INFO"):
-        """Log a message to the migration log panel with timestamp and color coding."""
+        """Queue a message for the migration log panel with timestamp and color coding.
+        
+        Safe to call from worker threads; the panel itself is only updated by
+        _drain_log_queue on the Tk main loop.
+        """
         try:
             timestamp = datetime.now().strftime("%H:%M:%S")
             
+            try:
+                self._log_queue.put_nowait((level, message, timestamp))
+            except queue.Full:
+                pass  # Panel is far behind; the line still reaches the console/file log below
+            
+            # Also log to console/file
+            getattr(logger, level.lower(), logger.info)(message)
+            
+        except Exception as e:
+            logger.error(f"Error logging migration message: {e}")
+
+    def _drain_log_queue(self):
+        """Flush queued migration log lines into the log panel with a single insert."""
+        try:
             # Add emoji based on level
             level_emojis = {
                 "INFO": "ℹ️",
@@ -1667,28 +1827,30 @@ class CosmosDBMigrationGUI:
                 "WARNING": "⚠️",
                 "ERROR": "❌",
                 "DEBUG": "🔍"
-           
             }
             
-            emoji = level_emojis.get(level, "📝")
-            formatted_message = f"[{timestamp}] {emoji} {message}\n"
-            
-            # Determine text tag for coloring
-            tag = level.lower()
+            # Interleaved (text, tag) pairs so each line keeps its level color
+            chunks = []
+            for _ in range(200):
+                try:
+                    level, message, timestamp = self._log_queue.get_nowait()
+                except queue.Empty:
+                    break
+                emoji = level_emojis.get(level, "📝")
+                chunks.append(f"[{timestamp}] {emoji} {message}\n")
+                chunks.append(level.lower())
             
-            # Insert into migration log
-            if hasattr(self, 'migration_log_text'):
-                self.migration_log_text.insert(tk.END, formatted_message, tag)
+            if chunks and hasattr(self, 'migration_log_text'):
+                self.migration_log_text.insert(tk.END, *chunks)
                 
                 # Auto-scroll if enabled
                 if hasattr(self, 'auto_scroll_var') and self.auto_scroll_var.get():
                     self.migration_log_text.see(tk.END)
-            
-            # Also log to console/file
-            getattr(logger, level.lower(), logger.info)(message)
-            
+                    
         except Exception as e:
-            logger.error(f"Error logging migration message: {e}")
+            logger.error(f"Error draining migration log: {e}")
+        finally:
+            self.root.after(100, self._drain_log_queue)
 
     def clear_migration_logs(self):
         """Clear the migration log panel."""
@@ -1796,10 +1958,12 @@ class CosmosDBMigrationGUI:
             if item in self.selected_collections:
                 # Deselect
                 self.selected_collections.remove(item)
+                self._selected_count -= 1
                 self.collections_tree.set(item, 'Selected', '☐')
             else:
                 # Select
                 self.selected_collections.add(item)
+                self._selected_count += 1
                 self.collections_tree.set(item, 'Selected', '☑')
             
             self.update_selected_summary()
@@ -1809,10 +1973,12 @@ class CosmosDBMigrationGUI:
     def select_all_collections(self):
         """Select all collections in the current database."""
         try:
-            for item in self.collections_tree.get_children():
-                if item not in self.selected_collections:
-                    self.selected_collections.add(item)
-                    self.collections_tree.set(item, 'Selected', '☑')
+            items = [item for item in self.collections_tree.get_children()
+                     if item not in self.selected_collections]
+            self.selected_collections.update(items)
+            self._selected_count = len(self.selected_collections)
+            
+            self._bulk_set_check(items, '☑')
             
             self.update_selected_summary()
             self.log_migration_message("Selected all collections", "INFO")
@@ -1822,17 +1988,54 @@ class CosmosDBMigrationGUI:
     def select_no_collections(self):
         """Deselect all collections."""
         try:
-            for item in list(self.selected_collections):
-                self.selected_collections.remove(item)
-                self.collections_tree.set(item, 'Selected', '☐')
+            items = list(self.selected_collections)
+            self.selected_collections.clear()
+            self._selected_count = 0
+            
+            self._bulk_set_check(items, '☐')
             
             self.update_selected_summary()
             self.log_migration_message("Deselected all collections", "INFO")
         except Exception as e:
             self.log_migration_message(f"Error deselecting collections: {str(e)}", "ERROR")
 
-    def refresh_collections(self):
-        """Refresh the collections list for the selected database."""
+    def _bulk_set_check(self, items, mark):
+        """Set the checkbox mark on many collection rows with a single tree relayout.
+        
+        Rows are detached while their values are rewritten from cached data, then
+        reattached in their original order in one call. Scroll position, focus and
+        tree selection are restored afterwards so the user stays where they were.
+        """
+        if not items:
+            return
+            
+        tree = self.collections_tree
+        children = tree.get_children()
+        first_visible = tree.yview()[0]
+        focused = tree.focus()
+        tree_selection = tree.selection()
+        tree.detach(*children)
+        try:
+            for item in items:
+                tree.item(item, values=self._collection_row_values(item, mark))
+        finally:
+            tree.set_children('', *children)
+            tree.yview_moveto(first_visible)
+            if focused:
+                tree.focus(focused)
+            if tree_selection:
+                tree.selection_set(tree_selection)
+        
+    def _collection_row_values(self, item, mark):
+        """Build the collections tree row values for an item with the given checkbox mark."""
+        return (mark,) + self.collection_data[item]['display']
+        
+    def refresh_collections(self, force=False):
+        """Refresh the collections list for the selected database.
+        
+        Args:
+            force: Bypass the migration service metadata cache
+        """
         try:
             selected_db = self.selected_db_var.get()
             if not selected_db or not self.migration_service:
@@ -1840,6 +2043,7 @@ class CosmosDBMigrationGUI:
                 for item in self.collections_tree.get_children():
                     self.collections_tree.delete(item)
                 self.selected_collections.clear()
+                self._selected_count = 0
                 self.collection_data.clear()
                 self.update_selected_summary()
                 return
@@ -1848,69 +2052,149 @@ class CosmosDBMigrationGUI:
             for item in self.collections_tree.get_children():
                 self.collections_tree.delete(item)
             self.selected_collections.clear()
+            self._selected_count = 0
             self.collection_data.clear()
 
             # Get collections from the database
-            collections = self.migration_service.list_collections(selected_db)
+            collections = self.migration_service.list_collections(selected_db, force=force)
+            self._pending_count_loads.clear()
+            self._count_cache_force = force
             
             for coll_name in collections:
-                try:
-                    # Get document count and size estimate
-                    doc_count = self.migration_service.get_collection_count(selected_db, coll_name)
-                    size_mb = "Calculating..."
-                    
-                    # Insert collection into tree
-                    item_id = self.collections_tree.insert('', 'end', values=('☐', coll_name, f"{doc_count:,}", size_mb))
-                    
-                    # Store collection metadata
-                    self.collection_data[item_id] = {
-                        'name': coll_name,
-                        'doc_count': doc_count,
-                        'size_mb': 0,
-                        'database': selected_db
-                    }
-                    
-                except Exception as e:
-                    # Insert with error info
-                    item_id = self.collections_tree.insert('', 'end', values=('☐', coll_name, 'Error', 'Error'))
-                    self.collection_data[item_id] = {
-                        'name': coll_name,
-                        'doc_count': 0,
-                        'size_mb': 0,
-                        'database': selected_db
-                    }
-                    logger.warning(f"Error getting collection info for {coll_name}: {e}")
+                # Counts are filled in lazily once the row scrolls into view
+                size_mb = "Calculating..."
+                item_id = self.collections_tree.insert('', 'end', values=('☐', coll_name, "…", size_mb))
+                
+                # Store collection metadata
+                self.collection_data[item_id] = {
+                    'name': coll_name,
+                    'doc_count': None,  # Estimated count, set once the row has been loaded
+                    'size_mb': 0,
+                    'database': selected_db,
+                    'loaded': False,
+                    'display': (coll_name, "…", size_mb)
+                }
 
+            self._on_tree_scroll()
             self.update_selected_summary()
             self.log_migration_message(f"Refreshed collections for database: {selected_db}", "INFO")
             
         except Exception as e:
             self.log_migration_message(f"Error refreshing collections: {str(e)}", "ERROR")
 
+    def _on_collections_yscroll(self, first, last):
+        """Forward collections tree scrolling to the scrollbar and load newly visible rows."""
+        self.collections_scrollbar.set(first, last)
+        self._on_tree_scroll()
+        
+    def _on_tree_scroll(self, event=None):
+        """Schedule a count lookup for visible rows once the tree is idle."""
+        if not self._visible_load_scheduled:
+            self._visible_load_scheduled = True
+            self.root.after_idle(self._load_visible_collection_counts)
+            
+    def _load_visible_collection_counts(self):
+        """Fetch document counts in the background for visible rows that are not loaded yet."""
+        self._visible_load_scheduled = False
+        if not self.migration_service:
+            return
+            
+        pending = []
+        seen_visible = False
+        for item in self.collections_tree.get_children():
+            if not self.collections_tree.bbox(item):
+                if seen_visible:
+                    break  # Past the bottom of the viewport
+                continue
+            seen_visible = True
+            
+            info = self.collection_data.get(item)
+            if info and not info.get('loaded', True) and item not in self._pending_count_loads:
+                self._pending_count_loads.add(item)
+                pending.append((item, info['database'], info['name']))
+                
+        if not pending:
+            return
+            
+        force = self._count_cache_force
+        
+        def load_counts():
+            for item, db_name, coll_name in pending:
+                doc_count = None
+                try:
+                    doc_count = self.migration_service.get_collection_count_fast(db_name, coll_name, force=force)
+                except Exception as e:
+                    logger.error(f"Error loading document count for {db_name}.{coll_name}: {e}")
+                finally:
+                    # Every row gets an answer, so failed rows leave the pending set and are retried
+                    if doc_count is None:
+                        self.result_queue.put(('collection_count_failed', item))
+                    else:
+                        self.result_queue.put(('collection_count', (item, db_name, doc_count)))
+                
+        self.run_in_background(load_counts)
+        
+    def update_collection_count(self, item, database_name, doc_count):
+        """Fill in a lazily loaded collection row."""
+        self._pending_count_loads.discard(item)
+        info = self.collection_data.get(item)
+        if not info or info['database'] != database_name:
+            return  # Row was replaced by a later refresh
+            
+        info['doc_count'] = doc_count
+        info['loaded'] = True
+        # Metadata estimate, not an exact count
+        info['display'] = (info['name'], f"~{doc_count:,}") + info['display'][2:]
+        selected = item in self.selected_collections
+        self.collections_tree.item(item, values=self._collection_row_values(item, '☑' if selected else '☐'))
+        if selected:
+            self.update_selected_summary()
+        
     def update_selected_summary(self):
         """Update the selected collections summary label."""
         try:
-            selected_count = len(self.selected_collections)
+            selected_count = self._selected_count
             if selected_count == 0:
                 summary = "No collections selected"
             elif selected_count == 1:
                 summary = "1 collection selected"
             else:
                 summary = f"{selected_count} collections selected"
+                
+            # Only rows whose estimate has loaded are summed; the rest are reported as uncounted
+            if selected_count:
+                counts = [self.collection_data[item]['doc_count'] for item in self.selected_collections]
+                loaded_counts = [count for count in counts if count is not None]
+                if loaded_counts:
+                    summary += f" (~{sum(loaded_counts):,} documents"
+                    if len(loaded_counts) < len(counts):
+                        summary += f", {len(counts) - len(loaded_counts)} not counted yet"
+                    summary += ")"
             
             self.selected_summary_var.set(summary)
         except Exception as e:
             self.selected_summary_var.set("Error updating summary")
 
+    def _on_sigint(self, signum, frame):
+        """Handle Ctrl-C by cancelling any running migration and closing the window."""
+        print("Application interrupted by user")
+        self._migration_stopped = True
+        if self.migration_service:
+            self.migration_service.cancel_event.set()
+        self.root.quit()
+        
     def run(self):
         """Start the GUI application main loop."""
         try:
+            # The 100ms result/log ticks give Python a chance to run this handler during mainloop
+            signal.signal(signal.SIGINT, self._on_sigint)
             self.root.mainloop()
-        except KeyboardInterrupt:
-            print("Application interrupted by user")
         except Exception as e:
             logger.error(f"GUI application error: {e}")
             raise
+        finally:
+            if self.migration_service:
+                self.migration_service.close()
 
 def main():
     """Main entry point for the GUI application."""
@@ -91,7 +91,10 @@ def main():
         )
         
         # Run the CLI interface
-        cli.run_interactive_mode(migration_service)
+        try:
+            cli.run_interactive_mode(migration_service)
+        finally:
+            migration_service.close()
         
         return 0
     
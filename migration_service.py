@@ -4,10 +4,18 @@ Implements retry logic for database operations using connection manager.
 """
 
 import logging
+import queue
+import threading
 import time
-import traceback
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import bson
+from bson import ObjectId
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
 from pymongo.errors import PyMongoError, BulkWriteError, ConnectionFailure, ServerSelectionTimeoutError
-from pymongo import ReplaceOne
+from pymongo import InsertOne, ReplaceOne
+from pymongo.results import BulkWriteResult
 from tqdm import tqdm
 
 try:
@@ -19,6 +27,22 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Documents are only moved, never inspected, so keep them as raw BSON in transit
+RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+
+def _count_raw_documents(raw_batch):
+    """Count the documents in a raw BSON batch by walking their length prefixes, without decoding."""
+    count = offset = 0
+    while offset + 4 <= len(raw_batch):
+        size = int.from_bytes(raw_batch[offset:offset + 4], "little")
+        if size < 5:  # Smallest valid document; anything less is corrupt
+            break
+        offset += size
+        count += 1
+    return count
+
+
 class MigrationService:
     """Service to handle migration of data between MongoDB instances with connection retry support."""
     
@@ -38,6 +62,33 @@ class MigrationService:
         self.connection_manager = connection_manager
         self.batch_size = batch_size
         
+        # Short-lived cache for collection listings and counts used by the UI; the lock
+        # covers the dict only, lookups run outside it
+        self._meta_cache = {}
+        self._meta_cache_lock = threading.Lock()
+        self.meta_cache_ttl = 30
+        
+        # Source query pushdown; _id is always fetched since upserts are keyed on it
+        self.query_filter = getattr(config, "query_filter", None) or {}
+        self.projection = getattr(config, "projection", None) or None
+        if self.projection and "_id" in self.projection and not self.projection["_id"]:
+            logger.warning("Ignoring _id exclusion in projection; _id is required for migration")
+            self.projection = {k: v for k, v in self.projection.items() if k != "_id"} or None
+        
+        # Set to stop in-flight migrations between batches (Stop button, Ctrl-C)
+        self.cancel_event = threading.Event()
+        
+        # Recommended RU partition keys, sampled once per (database, collection)
+        self._pk_cache = {}
+        
+        # Shared pool for per-partition bulk writes to RU targets (threads start on first use).
+        # It is sized from the worker budget, so partitioning batches never multiplies the
+        # number of bulk writes hitting a throttled account at once.
+        self.ru_write_partitions = 16
+        self._ru_write_executor = ThreadPoolExecutor(
+            max_workers=max(1, getattr(config, "migration_workers", 1)), thread_name_prefix="ru-write"
+        )
+        
         # Initialize Cosmos DB RU manager
         self.ru_manager = CosmosDBRUManager(dest_client, config)
         
@@ -53,6 +104,11 @@ class MigrationService:
             self.config.target_is_vcore = True
             logger.info("Target detected as vCore-based Cosmos DB - using standard MongoDB operations")
         
+    def close(self):
+        """Stop the RU write pool. Call once the service is no longer used."""
+        self.cancel_event.set()
+        self._ru_write_executor.shutdown(wait=True, cancel_futures=True)
+        
     def list_databases(self):
         """List all databases in the source with retry logic.
         
@@ -74,11 +130,39 @@ class MigrationService:
             logger.error(f"Error listing databases: {e}")
             return []
             
-    def list_collections(self, database_name):
+    def _cached(self, key, fn, force=False):
+        """Return a cached metadata value, calling fn when missing or older than meta_cache_ttl.
+        
+        Args:
+            key: Cache key tuple of (operation, database, collection)
+            fn: Callable producing the value
+            force: Bypass and refresh the cached entry
+            
+        Returns:
+            The cached or freshly computed value
+        """
+        if not force:
+            with self._meta_cache_lock:
+                entry = self._meta_cache.get(key)
+            if entry and time.monotonic() - entry[0] < self.meta_cache_ttl:
+                return entry[1]
+                
+        value = fn()
+        now = time.monotonic()
+        with self._meta_cache_lock:
+            # Drop expired entries so keys for dropped or renamed collections don't pile up
+            stale = [k for k, (stored_at, _) in self._meta_cache.items() if now - stored_at >= self.meta_cache_ttl]
+            for stale_key in stale:
+                del self._meta_cache[stale_key]
+            self._meta_cache[key] = (now, value)
+        return value
+            
+    def list_collections(self, database_name, force=False):
         """List all collections in a database with retry logic.
         
         Args:
             database_name: Name of the database
+            force: Bypass the metadata cache
             
         Returns:
             list: List of collection names
@@ -88,50 +172,98 @@ class MigrationService:
             collection_names = db.list_collection_names()
             return collection_names
         
-        try:
+        def _fetch():
             if self.connection_manager:
                 return self.connection_manager.execute_with_retry(_list_collections_operation, "source")
             else:
                 return _list_collections_operation()
+        
+        try:
+            return self._cached(("list_collections", database_name, None), _fetch, force)
         except PyMongoError as e:
             logger.error(f"Error listing collections for database {database_name}: {e}")
             return []
             
-    def count_documents(self, database_name, collection_name):
+    def count_documents(self, database_name, collection_name, query=None):
         """Count documents in a collection with retry logic.
         
         Args:
             database_name: Name of the database
             collection_name: Name of the collection
+            query: Optional filter; counts the whole collection when omitted
             
         Returns:
-            int: Number of documents in the collection
+            int: Number of documents in the collection, 0 if it can't be counted
+        """
+        try:
+            return self._count_documents(database_name, collection_name, query)
+        except PyMongoError as e:
+            logger.error(f"Error counting documents in {database_name}.{collection_name}: {e}")
+            return 0
+            
+    def _count_documents(self, database_name, collection_name, query=None):
+        """Count documents in a collection with retry logic, raising on failure.
+        
+        Raises:
+            PyMongoError: If the count fails after retries
         """
         def _count_documents_operation():
             db = self.source_client[database_name]
             collection = db[collection_name]
-            return collection.count_documents({})
+            return collection.count_documents(query or {})
+        
+        if self.connection_manager:
+            return self.connection_manager.execute_with_retry(_count_documents_operation, "source")
+        else:
+            return _count_documents_operation()
+            
+    def get_collection_count(self, database_name, collection_name, force=False):
+        """Get document count for a collection (cached alias for count_documents).
         
+        Args:
+            database_name: Name of the database
+            collection_name: Name of the collection
+            force: Bypass the metadata cache
+            
+        Returns:
+            int: Number of documents in the collection, 0 if it can't be counted
+        """
+        # Failures raise out of _cached, so an error is never cached as a count of 0
         try:
-            if self.connection_manager:
-                return self.connection_manager.execute_with_retry(_count_documents_operation, "source")
-            else:
-                return _count_documents_operation()
+            return self._cached(
+                ("count_documents", database_name, collection_name),
+                lambda: self._count_documents(database_name, collection_name),
+                force
+            )
         except PyMongoError as e:
             logger.error(f"Error counting documents in {database_name}.{collection_name}: {e}")
             return 0
-            
-    def get_collection_count(self, database_name, collection_name):
-        """Get document count for a collection (alias for count_documents).
+        
+    def get_collection_count_fast(self, database_name, collection_name, force=False):
+        """Get an estimated document count from collection metadata (cached).
         
         Args:
             database_name: Name of the database
             collection_name: Name of the collection
+            force: Bypass the metadata cache
             
         Returns:
-            int: Number of documents in the collection
+            int: Estimated number of documents in the collection
         """
-        return self.count_documents(database_name, collection_name)
+        def _estimated_count_operation():
+            return self.source_client[database_name][collection_name].estimated_document_count()
+        
+        def _fetch():
+            if self.connection_manager:
+                return self.connection_manager.execute_with_retry(_estimated_count_operation, "source")
+            else:
+                return _estimated_count_operation()
+        
+        try:
+            return self._cached(("estimated_document_count", database_name, collection_name), _fetch, force)
+        except PyMongoError as e:
+            logger.error(f"Error estimating document count in {database_name}.{collection_name}: {e}")
+            return 0
         
     def migrate_database(self, database_name):
         """Migrate an entire database.
@@ -143,23 +275,31 @@ class MigrationService:
             dict: Migration statistics
         """
         try:
-            collections = self.list_collections(database_name)
+            # Always list afresh so collections created since the last browse are migrated too
+            collections = self.list_collections(database_name, force=True)
             
             stats = {
                 "total_collections": len(collections),
                 "successful_collections": 0,
                 "failed_collections": 0,
+                "cancelled_collections": 0,
                 "total_documents": 0,
                 "migrated_documents": 0,
                 "failed_documents": 0
             }
             
             for collection_name in collections:
+                if self.cancel_event.is_set():
+                    logger.warning(f"Migration of database {database_name} cancelled")
+                    break
+                    
                 logger.info(f"Migrating collection: {database_name}.{collection_name}")
                 collection_stats = self.migrate_collection(database_name, collection_name)
                 
                 # Update statistics
-                if collection_stats["success"]:
+                if collection_stats.get("cancelled"):
+                    stats["cancelled_collections"] += 1
+                elif collection_stats["success"]:
                     stats["successful_collections"] += 1
                 else:
                     stats["failed_collections"] += 1
@@ -173,7 +313,7 @@ class MigrationService:
             
         except Exception as e:
             logger.error(f"Error migrating database {database_name}: {e}")
-            logger.debug(traceback.format_exc())
+            logger.debug("Database migration failed", exc_info=True)
             return {
                 "success": False,
                 "error": str(e)
@@ -200,10 +340,16 @@ class MigrationService:
                 # For RU-based Cosmos DB, create collection with throughput settings
                 logger.info(f"Creating RU-based collection {database_name}.{collection_name}")
                 
-                # Get recommended partition key
-                partition_key = self.ru_manager.get_recommended_partition_key(
-                    database_name, collection_name, self.source_client
-                )
+                # Get recommended partition key (sampling the source only on first use)
+                pk_key = (database_name, collection_name)
+                partition_key = self._pk_cache.get(pk_key)
+                if partition_key is None:
+                    partition_key = self._pk_cache.setdefault(
+                        pk_key,
+                        self.ru_manager.get_recommended_partition_key(
+                            database_name, collection_name, self.source_client
+                        )
+                    )
                 
                 success = self.ru_manager.ensure_collection_exists(
                     database_name, collection_name, partition_key
@@ -229,7 +375,8 @@ class MigrationService:
             dest_collection = dest_db[collection_name]
             
             # Count documents for progress tracking
-            total_documents = self.count_documents(database_name, collection_name)
+            # Raises on failure, so an unreadable collection isn't mistaken for an empty one
+            total_documents = self._count_documents(database_name, collection_name, self.query_filter)
             
             if total_documents == 0:
                 logger.info(f"Collection {database_name}.{collection_name} is empty. Nothing to migrate.")
@@ -245,6 +392,9 @@ class MigrationService:
             if dest_count > 0:
                 logger.info(f"Destination collection {database_name}.{collection_name} already has {dest_count} documents. Using upsert operations to handle duplicates.")
                 
+            # An empty destination can take plain inserts; switch to upserts on the first duplicate key
+            write_mode = {"insert_only": dest_count == 0}
+            
             # Initialize statistics
             stats = {
                 "success": True,
@@ -259,35 +409,68 @@ class MigrationService:
             # Create progress bar
             progress_bar = tqdm(total=total_documents, desc=f"Migrating {database_name}.{collection_name}")
             
-            # Process documents in batches
-            cursor = source_collection.find({})
-            batch = []
+            # Overlap source reads with destination writes: this thread streams raw
+            # BSON batches from the source while workers decode and bulk_write them
+            workers = max(1, getattr(self.config, "migration_workers", 1))
+            batch_queue = queue.Queue(maxsize=workers * 2)
+            stats_lock = threading.Lock()
             
-            for document in cursor:
-                batch.append(document)
-                
-                if len(batch) >= self.batch_size:
-                    batch_stats = self._process_batch(dest_collection, batch)
-                    stats["migrated_documents"] += batch_stats["inserted"]
-                    stats["failed_documents"] += batch_stats["failed"]
-                    stats["inserted_documents"] += batch_stats.get("raw_inserted", 0)
-                    stats["upserted_documents"] += batch_stats.get("upserted", 0)
-                    stats["modified_documents"] += batch_stats.get("modified", 0)
-                    progress_bar.update(len(batch))
-                    batch = []
-                    
-            # Process remaining documents
-            if batch:
-                batch_stats = self._process_batch(dest_collection, batch)
-                stats["migrated_documents"] += batch_stats["inserted"]
-                stats["failed_documents"] += batch_stats["failed"]
-                stats["inserted_documents"] += batch_stats.get("raw_inserted", 0)
-                stats["upserted_documents"] += batch_stats.get("upserted", 0)
-                stats["modified_documents"] += batch_stats.get("modified", 0)
-                progress_bar.update(len(batch))
+            def _write_batches():
+                while True:
+                    raw_batch = batch_queue.get()
+                    if raw_batch is None:
+                        return
+                    if self.cancel_event.is_set():
+                        continue  # Keep draining until the sentinel arrives
+                    batch = None
+                    try:
+                        batch = bson.decode_all(raw_batch, RAW_CODEC_OPTIONS)
+                        batch_stats = self._process_batch(dest_collection, batch, write_mode["insert_only"])
+                    except Exception as e:
+                        failed = len(batch) if batch is not None else _count_raw_documents(raw_batch)
+                        logger.error(f"Error writing batch of {failed} documents to {database_name}.{collection_name}: {e}",
+                                     exc_info=True)
+                        with stats_lock:
+                            stats["failed_documents"] += failed
+                            progress_bar.update(failed)
+                        continue
+                        
+                    with stats_lock:
+                        if batch_stats.get("duplicate_keys") and write_mode["insert_only"]:
+                            write_mode["insert_only"] = False
+                            logger.info(f"Duplicate keys found in {database_name}.{collection_name}. Switching to upsert operations.")
+                        stats["migrated_documents"] += batch_stats["inserted"]
+                        stats["failed_documents"] += batch_stats["failed"]
+                        stats["inserted_documents"] += batch_stats.get("raw_inserted", 0)
+                        stats["upserted_documents"] += batch_stats.get("upserted", 0)
+                        stats["modified_documents"] += batch_stats.get("modified", 0)
+                        progress_bar.update(len(batch))
+            
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_write_batches) for _ in range(workers)]
+                try:
+                    for raw_batch in source_collection.find_raw_batches(
+                        self.query_filter, projection=self.projection, batch_size=self.batch_size
+                    ):
+                        if self.cancel_event.is_set():
+                            break
+                        batch_queue.put(raw_batch)
+                finally:
+                    # One sentinel per worker so every consumer exits
+                    for _ in range(workers):
+                        batch_queue.put(None)
+                        
+                for future in futures:
+                    future.result()
                 
             progress_bar.close()
             
+            # A cancel can also land after the last batch was queued, while workers were still writing
+            if self.cancel_event.is_set():
+                logger.warning(f"Migration of {database_name}.{collection_name} cancelled")
+                stats["cancelled"] = True
+                stats["success"] = False
+            
             # Log results with detailed statistics
             logger.info(f"Collection migration completed. {stats['migrated_documents']} of {total_documents} documents processed.")
             logger.info(f"Upsert details - Inserted: {stats['inserted_documents']}, "
@@ -300,7 +483,7 @@ class MigrationService:
             
         except Exception as e:
             logger.error(f"Error migrating collection {database_name}.{collection_name}: {e}")
-            logger.debug(traceback.format_exc())
+            logger.debug("Collection migration failed", exc_info=True)
             return {
                 "success": False,
                 "total_documents": 0,
@@ -309,12 +492,82 @@ class MigrationService:
                 "error": str(e)
             }
             
-    def _process_batch(self, dest_collection, batch):
+    def _bulk_write_partitioned(self, dest_collection, operations, batch):
+        """Write a batch to an RU target as concurrent per-partition bulk writes.
+        
+        Documents are bucketed by a hash of their _id so a throttled (429) partition
+        only stalls its own bucket instead of the whole batch.
+        
+        Args:
+            dest_collection: Destination collection
+            operations: Write operations, one per document in batch
+            batch: Source documents the operations were built from
+            
+        Returns:
+            BulkWriteResult: Combined counts for all buckets
+            
+        Raises:
+            BulkWriteError: If any bucket reported write errors or failed outright while
+                others were written; indexes refer to batch
+            PyMongoError: If every bucket failed outright, so nothing was written
+        """
+        mask = self.ru_write_partitions - 1
+        buckets = defaultdict(list)
+        for index, document in enumerate(batch):
+            buckets[hash(str(document.get("_id"))) & mask].append(index)
+            
+        if len(buckets) < 2:
+            return dest_collection.bulk_write(operations, ordered=False)
+            
+        futures = [
+            (indexes, self._ru_write_executor.submit(
+                dest_collection.bulk_write, [operations[i] for i in indexes], ordered=False
+            ))
+            for indexes in buckets.values()
+        ]
+        
+        details = {"nInserted": 0, "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0,
+                   "upserted": [], "writeErrors": [], "writeConcernErrors": []}
+        failure = None
+        failed_buckets = 0
+        for indexes, future in futures:
+            try:
+                bucket_result = future.result().bulk_api_result
+            except BulkWriteError as e:
+                bucket_result = e.details
+            except Exception as e:
+                # Other buckets may have committed already, so only this bucket's documents fail
+                failure = failure or e
+                failed_buckets += 1
+                details["writeErrors"].extend(
+                    {"index": i, "code": None, "errmsg": f"Partition write failed: {e}", "op": batch[i]}
+                    for i in indexes
+                )
+                continue
+                
+            for key in ("nInserted", "nUpserted", "nMatched", "nModified", "nRemoved"):
+                details[key] += bucket_result.get(key, 0)
+            for upserted in bucket_result.get("upserted", []):
+                details["upserted"].append(dict(upserted, index=indexes[upserted["index"]]))
+            for error in bucket_result.get("writeErrors", []):
+                details["writeErrors"].append(dict(error, index=indexes[error["index"]]))
+            details["writeConcernErrors"].extend(bucket_result.get("writeConcernErrors", []))
+            
+        # Nothing was written, so the whole batch can safely go back to execute_with_retry
+        if failure and failed_buckets == len(futures):
+            raise failure
+        if details["writeErrors"] or details["writeConcernErrors"]:
+            raise BulkWriteError(details)
+        return BulkWriteResult(details, True)
+        
+    def _process_batch(self, dest_collection, batch, insert_only=False):
         """Process a batch of documents with retry logic for connection failures.
         
         Args:
             dest_collection: Destination collection
             batch: List of documents to upsert
+            insert_only: Use plain inserts instead of upserts (destination known to be empty).
+                Documents rejected with a duplicate key are retried as upserts.
             
         Returns:
             dict: Batch processing statistics
@@ -322,27 +575,34 @@ class MigrationService:
         def _process_batch_operation():
             stats = {"inserted": 0, "failed": 0, "upserted": 0, "modified": 0}
             
-            if not batch:
+            if not batch or self.cancel_event.is_set():
                 return stats
                 
             try:
-                # Prepare bulk upsert operations
-                operations = []
-                for document in batch:
-                    # Use _id as the filter for upsert operation
-                    # If document doesn't have _id, we'll let MongoDB generate one during insert
-                    if "_id" in document:
-                        filter_doc = {"_id": document["_id"]}
-                        # Create ReplaceOne operation with upsert=True
-                        operations.append(ReplaceOne(filter_doc, document, upsert=True))
-                    else:
-                        # For documents without _id, we'll use insert_one to let MongoDB generate the _id
-                        # But since we're in a batch operation, we'll add a temporary _id for the filter
-                        # and let the upsert create a new document
-                        operations.append(ReplaceOne({}, document, upsert=True))
+                if insert_only:
+                    # Fresh destination: a straight insert avoids the per-document upsert lookup
+                    operations = [InsertOne(document) for document in batch]
+                else:
+                    # Prepare bulk upsert operations keyed on _id, which every stored document has
+                    _ReplaceOne = ReplaceOne
+                    try:
+                        operations = [_ReplaceOne({"_id": document["_id"]}, document, upsert=True) for document in batch]
+                    except KeyError:
+                        # Documents without an _id get a client-side ObjectId instead of an empty filter,
+                        # which would upsert them all into the same document. Raw BSON documents are
+                        # read-only, so those are copied.
+                        _ObjectId = ObjectId
+                        operations = [
+                            _ReplaceOne({"_id": document["_id"]}, document, upsert=True) if "_id" in document
+                            else _ReplaceOne({"_id": (new_id := _ObjectId())}, {**document, "_id": new_id}, upsert=True)
+                            for document in batch
+                        ]
                 
                 # Execute bulk write operation
-                result = dest_collection.bulk_write(operations, ordered=False)
+                if not self.config.target_is_vcore:
+                    result = self._bulk_write_partitioned(dest_collection, operations, batch)
+                else:
+                    result = dest_collection.bulk_write(operations, ordered=False)
                 
                 # Update statistics based on the result
                 stats["inserted"] = result.inserted_count + result.upserted_count + result.modified_count
@@ -359,7 +619,7 @@ class MigrationService:
                 
             except BulkWriteError as e:
                 # Some documents were processed successfully
-                result = e.details.get('writeResult', {})
+                result = e.details.get('writeResult', e.details)
                 write_errors = e.details.get('writeErrors', [])
                 
                 # Get successful operations
@@ -371,6 +631,14 @@ class MigrationService:
                 stats["upserted"] = upserted_count
                 stats["modified"] = modified_count
                 stats["raw_inserted"] = inserted_count
+                
+                if insert_only:
+                    # Documents already present in the destination are handed back for an upsert pass
+                    duplicates = [batch[error["index"]] for error in write_errors if error.get("code") == 11000]
+                    if duplicates:
+                        stats["duplicate_keys"] = duplicates
+                        write_errors = [error for error in write_errors if error.get("code") != 11000]
+                
                 stats["failed"] = len(write_errors)
                 
                 for error in write_errors:
@@ -378,6 +646,8 @@ class MigrationService:
                     
                 return stats
                 
+            except ConnectionFailure:
+                raise  # Let execute_with_retry reconnect and replay the batch
             except PyMongoError as e:
                 # Failed to process any documents
                 logger.error(f"Batch upsert processing error: {e}")
@@ -387,9 +657,18 @@ class MigrationService:
         # Execute with retry logic if connection manager is available
         try:
             if self.connection_manager:
-                return self.connection_manager.execute_with_retry(_process_batch_operation, "destination")
+                stats = self.connection_manager.execute_with_retry(_process_batch_operation, "destination")
             else:
-                return _process_batch_operation()
+                stats = _process_batch_operation()
         except Exception as e:
             logger.error(f"Batch processing failed after retries: {e}")
             return {"inserted": 0, "failed": len(batch), "upserted": 0, "modified": 0}
+            
+        duplicates = stats.get("duplicate_keys")
+        if duplicates:
+            upsert_stats = self._process_batch(dest_collection, duplicates)
+            for key in ("inserted", "failed", "upserted", "modified", "raw_inserted"):
+                stats[key] = stats.get(key, 0) + upsert_stats.get(key, 0)
+            stats["duplicate_keys"] = True
+            
+        return stats
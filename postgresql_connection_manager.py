@@ -1,97 +1,434 @@
 """
 PostgreSQL connection manager for Azure Database Migration Tool.
-Implements connection management, retry logic, and health monitoring for PostgreSQL databases.
+Implements connection management, retry logic, and on-demand health checks for PostgreSQL databases.
 """
 
+import datetime
+import io
+import json
 import logging
+import random
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
 import psycopg2
 from psycopg2 import pool, sql, OperationalError, DatabaseError
+from psycopg2.extensions import TRANSACTION_STATUS_UNKNOWN
+from psycopg2.extras import Range
 from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
 import getpass
 
 logger = logging.getLogger(__name__)
 
+# psycopg2 linked against libpq 16+ leaks memory on every connection setup/teardown,
+# which adds up when pools are rebuilt during long migrations
+_LEAKY_LIBPQ_VERSION = 160000
+
+
+def _check_libpq_version():
+    """Return the libpq version psycopg2 runs against, logging it at debug level."""
+    try:
+        libpq_version = psycopg2.extensions.libpq_version()
+    except Exception:
+        libpq_version = getattr(psycopg2, "__libpq_version__", 0)
+        
+    logger.debug(f"psycopg2 {psycopg2.__version__} using libpq {libpq_version}")
+    return libpq_version
+
+
+_LIBPQ_VERSION = _check_libpq_version()
+_libpq_warning_logged = False
+
+
+def _warn_if_leaky_libpq():
+    """Warn once per process, when a PostgreSQL pool is first created, if libpq is affected by the leak."""
+    global _libpq_warning_logged
+    if _libpq_warning_logged or _LIBPQ_VERSION < _LEAKY_LIBPQ_VERSION:
+        return
+    _libpq_warning_logged = True
+    logger.warning(
+        f"psycopg2 is using libpq {_LIBPQ_VERSION // 10000}, which leaks memory on repeated "
+        f"reconnects. For long migrations build psycopg2 against libpq 15 "
+        f"(pip install --no-binary psycopg2 psycopg2) or keep pool rebuilds rare."
+    )
+
+
+# Upper bound for any single retry sleep
+_MAX_RETRY_DELAY_SECONDS = 30.0
+
+
+def _decorrelated_jitter(base, prev_delay, cap=_MAX_RETRY_DELAY_SECONDS):
+    """Next retry delay using decorrelated jitter, so concurrent clients retry out of step.
+    
+    Args:
+        base: Minimum delay in seconds
+        prev_delay: Delay used for the previous attempt (base for the first retry)
+        cap: Maximum delay in seconds
+        
+    Returns:
+        float: Delay in seconds
+    """
+    return min(cap, random.uniform(base, max(base, prev_delay * 3)))
+
+
+# Connections per pool left over for metadata queries and health checks
+POOL_HEADROOM = 2
+# Default pools are never smaller than this, so a few extra borrowers don't queue
+_MIN_DEFAULT_POOL_SIZE = 25
+
+
+def required_pool_size(workers):
+    """Connections one PostgreSQL pool needs to serve a number of concurrent copy workers.
+    
+    Each worker reads through the source pool and writes through the destination
+    pool, so it holds one connection per pool at a time.
+    
+    Args:
+        workers: Number of concurrent table or range copies
+        
+    Returns:
+        int: Minimum maxconn for each pool
+    """
+    return max(1, workers) + POOL_HEADROOM
+
+
+# Characters that must be backslash-escaped in COPY text format
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _quote_literal_element(text):
+    """Double-quote an element of an array or range literal, escaping quotes and backslashes."""
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _pg_scalar_text(value):
+    """Render a non-NULL scalar as PostgreSQL input text (before any COPY escaping).
+    
+    Covers the types psycopg2 decodes to objects whose str() is not valid input:
+    ranges, intervals, bytea and json documents.
+    """
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + bytes(value).hex()
+    if isinstance(value, dict):
+        return json.dumps(value)
+    if isinstance(value, Range):
+        if value.isempty:
+            return "empty"
+        lower = "" if value.lower is None else _quote_literal_element(_pg_scalar_text(value.lower))
+        upper = "" if value.upper is None else _quote_literal_element(_pg_scalar_text(value.upper))
+        return f"{'[' if value.lower_inc else '('}{lower},{upper}{']' if value.upper_inc else ')'}"
+    if isinstance(value, datetime.timedelta):
+        return f"{value.days} days {value.seconds} seconds {value.microseconds} microseconds"
+    return str(value)
+
+
+def _array_element_literal(value):
+    """Render one element of a PostgreSQL array literal, quoted and escaped."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, (list, tuple)):
+        return _array_literal(value)
+    return _quote_literal_element(_pg_scalar_text(value))
+
+
+def _array_literal(values):
+    """Render a (possibly nested) list as a PostgreSQL array literal, e.g. {"1","2"}."""
+    return "{" + ",".join(map(_array_element_literal, values)) + "}"
+
+
+def _copy_text_value(value, is_json=False):
+    """Render a Python value as a field in PostgreSQL COPY text format.
+    
+    Lists are sent as array literals, since psycopg2 decodes array columns to lists.
+    json/jsonb columns are also decoded to Python objects (lists included), so
+    values bound for them must be flagged with is_json to be sent as JSON.
+    
+    Args:
+        value: Python value as returned by psycopg2
+        is_json: The target column is json or jsonb
+    """
+    if value is None:
+        return "\\N"
+    if is_json:
+        text = json.dumps(value)
+    elif isinstance(value, (list, tuple)):
+        text = _array_literal(value)
+    else:
+        text = _pg_scalar_text(value)
+    return text.translate(_COPY_ESCAPES)
+
+
+def _copy_text_line(row, json_columns=None):
+    """Render a row as one line of COPY text format.
+    
+    Args:
+        row: Row tuple in column order
+        json_columns: Optional sequence of booleans, one per column, marking json/jsonb columns
+    """
+    if json_columns:
+        return "\t".join(map(_copy_text_value, row, json_columns)) + "\n"
+    return "\t".join(map(_copy_text_value, row)) + "\n"
+
+
+class _IteratorReader(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks, for cursor.copy_expert."""
+    
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._pending = b""
+        
+    def readable(self):
+        return True
+        
+    def readinto(self, buffer):
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+# AAD scope for Azure Database for PostgreSQL access tokens
+_PG_TOKEN_SCOPE = "https://ossrdbms-aad.database.windows.net/.default"
+
+
+class _TokenConnectionPool(pool.ThreadedConnectionPool):
+    """ThreadedConnectionPool that resolves the password for every new physical connection.
+    
+    Used with Managed Identity so connections opened late in a migration get a current
+    access token instead of the one that was valid when the pool was created.
+    """
+    
+    # Server version string, fetched once per side and carried over to rebuilt pools
+    pg_version = None
+    
+    def __init__(self, minconn, maxconn, *args, password_provider=None, **kwargs):
+        self._password_provider = password_provider
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        
+    def _connect(self, key=None):
+        if self._password_provider:
+            self._kwargs["password"] = self._password_provider()
+        return super()._connect(key)
+        
+    def prune(self):
+        """Close idle connections that no longer answer, keeping the healthy ones warm.
+        
+        If no idle connection survives, one new connection is opened to confirm the
+        server is reachable.
+        
+        Returns:
+            int: Number of connections dropped
+            
+        Raises:
+            PoolError: If the pool is closed
+            OperationalError: If the server can't be reached with a new connection either
+        """
+        with self._lock:
+            if self.closed:
+                raise pool.PoolError("connection pool is closed")
+            idle, self._pool = self._pool, []
+            
+        # Probe outside the lock so borrowers aren't held up by slow round trips
+        healthy = []
+        for conn in idle:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                conn.rollback()
+                healthy.append(conn)
+            except Exception:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+                    
+        with self._lock:
+            self._pool.extend(healthy)
+            if not healthy:
+                self._connect()
+        return len(idle) - len(healthy)
+
+
 class PostgreSQLConnectionManager:
-    """Manages connections to source and destination PostgreSQL instances with retry logic and health monitoring."""
+    """Manages connections to source and destination PostgreSQL instances with retry logic and on-demand health checks."""
     
-    def __init__(self, config):
+    # Config attribute holding the connection string for each side
+    _CONNECTION_STRING_ATTRS = {
+        "source": "pg_source_connection_string",
+        "destination": "pg_dest_connection_string",
+    }
+    
+    def __init__(self, config, interactive=True):
         """Initialize the PostgreSQL connection manager with configuration.
         
+        Connection settings are read once here. Missing connection strings are
+        prompted for up front, so connecting later never blocks a worker thread on
+        terminal input.
+        
         Args:
             config: Config object containing connection settings
+            interactive: Prompt on the terminal for missing connection strings;
+                pass False when the caller (e.g. the GUI) supplies them itself
         """
         self.config = config
-        self.source_pool = None
-        self.dest_pool = None
-        self._source_healthy = False
-        self._dest_healthy = False
-        self._health_check_lock = threading.Lock()
-        self._shutdown_requested = False
-        
-        # Start health monitoring thread
-        self._health_monitor_thread = threading.Thread(target=self._health_monitor, daemon=True)
-        self._health_monitor_thread.start()
-        
-    def _health_monitor(self):
-        """Background health monitoring for PostgreSQL connections."""
-        while not self._shutdown_requested:
-            try:
-                # Check source connection health
-                if self.source_pool:
-                    try:
-                        conn = self.source_pool.getconn()
-                        with conn.cursor() as cursor:
-                            cursor.execute("SELECT 1")
-                            cursor.fetchone()
-                        self.source_pool.putconn(conn)
-                        with self._health_check_lock:
-                            self._source_healthy = True
-                    except Exception as e:
-                        logger.warning(f"Source PostgreSQL connection health check failed: {e}")
-                        with self._health_check_lock:
-                            self._source_healthy = False
-                
-                # Check destination connection health
-                if self.dest_pool:
-                    try:
-                        conn = self.dest_pool.getconn()
-                        with conn.cursor() as cursor:
-                            cursor.execute("SELECT 1")
-                            cursor.fetchone()
-                        self.dest_pool.putconn(conn)
-                        with self._health_check_lock:
-                            self._dest_healthy = True
-                    except Exception as e:
-                        logger.warning(f"Destination PostgreSQL connection health check failed: {e}")
-                        with self._health_check_lock:
-                            self._dest_healthy = False
-                
-                # Sleep for configured interval before next health check
-                time.sleep(self.config.health_check_interval_seconds)
-                
-            except Exception as e:
-                logger.error(f"Error in PostgreSQL health monitoring: {e}")
-                time.sleep(self.config.health_check_interval_seconds)
-                
+        self._pools = {"source": None, "destination": None}
+        self._pg_versions = {}  # Server version string per side, from the first successful connect
+        
+        # Resolved once so a connect can't see the config change halfway through
+        self._use_mi = bool(getattr(config, 'use_managed_identity', False))
+        self._dsns = {}
+        for which, config_attr in self._CONNECTION_STRING_ATTRS.items():
+            connection_string = getattr(config, config_attr, None)
+            if not connection_string and interactive and not self._use_mi:
+                connection_string = self._prompt_for_connection_string(f"{which} PostgreSQL")
+                setattr(config, config_attr, connection_string)
+            self._dsns[which] = connection_string
+        
+        # Managed Identity credential and access token, shared by both pools
+        self._credential = None
+        self._token_cache = {"token": None, "expires_on": 0}
+        self._token_lock = threading.Lock()
+        
+    @property
+    def source_pool(self):
+        """psycopg2 connection pool for the source instance, or None if not connected."""
+        return self._pools["source"]
+        
+    @source_pool.setter
+    def source_pool(self, value):
+        self._pools["source"] = value
+        
+    @property
+    def dest_pool(self):
+        """psycopg2 connection pool for the destination instance, or None if not connected."""
+        return self._pools["destination"]
+        
+    @dest_pool.setter
+    def dest_pool(self, value):
+        self._pools["destination"] = value
+        
+    @staticmethod
+    @contextmanager
+    def _pooled_connection(pool_obj):
+        """Borrow a connection from a pool, validating it before handing it out.
+        
+        Connections the server or network already closed are discarded instead of
+        being returned to the caller, so the pool heals itself on the next borrow.
+        
+        Args:
+            pool_obj: psycopg2 connection pool to borrow from
+            
+        Yields:
+            psycopg2 connection, returned to the pool (or discarded if broken) on exit
+        """
+        for _ in range(pool_obj.maxconn + 1):
+            conn = pool_obj.getconn()
+            if not conn.closed and conn.info.transaction_status != TRANSACTION_STATUS_UNKNOWN:
+                break
+            pool_obj.putconn(conn, close=True)
+        else:
+            raise OperationalError("No usable PostgreSQL connection available in pool")
+            
+        try:
+            yield conn
+        finally:
+            # putconn rolls back any open transaction; broken connections are closed
+            pool_obj.putconn(conn, close=bool(conn.closed))
+            
+    def connection(self, client_type="source"):
+        """Borrow a validated connection from the source or destination pool.
+        
+        Usage::
+        
+            with pg_connection_manager.connection("source") as conn:
+                ...
+        
+        Args:
+            client_type: "source" or "destination"
+            
+        Returns:
+            Context manager yielding a psycopg2 connection
+            
+        Raises:
+            OperationalError: If the requested pool is not connected
+        """
+        pool_obj = self._pools.get(client_type)
+        if pool_obj is None:
+            raise OperationalError(f"PostgreSQL {client_type} pool is not connected")
+        return self._pooled_connection(pool_obj)
+        
     def is_source_healthy(self):
         """Check if source PostgreSQL connection is healthy.
         
+        Individual connections are validated when borrowed, so the pool is healthy
+        as long as it is open.
+        
         Returns:
             bool: True if source connection is healthy
         """
-        with self._health_check_lock:
-            return self._source_healthy
+        return self._is_healthy("source")
             
     def is_dest_healthy(self):
         """Check if destination PostgreSQL connection is healthy.
         
+        Individual connections are validated when borrowed, so the pool is healthy
+        as long as it is open.
+        
         Returns:
             bool: True if destination connection is healthy
         """
-        with self._health_check_lock:
-            return self._dest_healthy
+        return self._is_healthy("destination")
+        
+    def _is_healthy(self, which):
+        """Check whether the pool for "source" or "destination" is open."""
+        pool_obj = self._pools[which]
+        return pool_obj is not None and not pool_obj.closed
+        
+    def _prune_pool(self, client_type):
+        """Drop broken idle connections from a pool instead of rebuilding it.
+        
+        Only used after an operation failed with OperationalError, to tell a dead
+        server apart from a few broken connections.
+        
+        Args:
+            client_type: "source" or "destination"
+            
+        Returns:
+            bool: True if the pool is still usable
+        """
+        pool_obj = self._pools.get(client_type)
+        if pool_obj is None:
+            return False
+        try:
+            dropped = pool_obj.prune()
+            if dropped:
+                logger.info("Dropped %s broken %s PostgreSQL connection(s)", dropped, client_type)
+            return True
+        except Exception as e:
+            logger.warning("PostgreSQL %s pool check failed: %s", client_type, e)
+            return False
+            
+    def _reset_pool(self, client_type):
+        """Close a pool whose server stopped answering so the next connect rebuilds it.
+        
+        Args:
+            client_type: "source" or "destination"
+        """
+        pool_obj = self._pools.get(client_type)
+        self._pools[client_type] = None
+        if pool_obj is not None and not pool_obj.closed:
+            try:
+                pool_obj.closeall()
+            except Exception as e:
+                logger.warning(f"Error closing unhealthy {client_type} PostgreSQL connection pool: {e}")
             
     def connect_to_source(self, retry_on_failure=True):
         """Connect to the source PostgreSQL instance with retry logic.
@@ -102,50 +439,8 @@ class PostgreSQLConnectionManager:
         Returns:
             psycopg2.pool.ThreadedConnectionPool: Connected PostgreSQL connection pool or None if connection fails
         """
-        try:
-            # Check existing connection health
-            if self.source_pool and self.is_source_healthy():
-                logger.debug("Using existing healthy source PostgreSQL connection")
-                return self.source_pool
-                
-            # If connection exists but is unhealthy, close it
-            if self.source_pool and not self.is_source_healthy():
-                logger.info("Existing source PostgreSQL connection is unhealthy, reconnecting...")
-                try:
-                    self.source_pool.closeall()
-                except Exception as e:
-                    logger.warning(f"Error closing unhealthy source PostgreSQL connection: {e}")
-                self.source_pool = None
-                
-            connection_string = getattr(self.config, 'pg_source_connection_string', None)
-            
-            # Prompt for connection string if not provided
-            if not connection_string and not getattr(self.config, 'use_managed_identity', False):
-                connection_string = self._prompt_for_connection_string("source PostgreSQL")
-                self.config.pg_source_connection_string = connection_string
-                
-            if getattr(self.config, 'use_managed_identity', False):
-                logger.info("Connecting to source PostgreSQL using Managed Identity")
-                # For Azure PostgreSQL with Managed Identity
-                self.source_pool = self._create_pg_pool_with_managed_identity(connection_string, "source")
-            else:
-                logger.info("Connecting to source PostgreSQL using connection string")
-                self.source_pool = self._create_pg_pool_with_retry(connection_string, "source")
-                
-            # Mark as healthy after successful connection
-            with self._health_check_lock:
-                self._source_healthy = True
-                
-            logger.info("Successfully connected to source PostgreSQL instance")
-            return self.source_pool
-            
-        except Exception as e:
-            logger.error(f"Failed to connect to source PostgreSQL instance: {e}")
-            self.source_pool = None
-            with self._health_check_lock:
-                self._source_healthy = False
-            return None
-            
+        return self._connect("source")
+        
     def connect_to_destination(self, retry_on_failure=True):
         """Connect to the destination PostgreSQL instance with retry logic.
         
@@ -155,56 +450,58 @@ class PostgreSQLConnectionManager:
         Returns:
             psycopg2.pool.ThreadedConnectionPool: Connected PostgreSQL connection pool or None if connection fails
         """
+        return self._connect("destination")
+        
+    def _connect(self, which):
+        """Connect to the source or destination PostgreSQL instance with retry logic.
+        
+        Args:
+            which: "source" or "destination"
+            
+        Returns:
+            psycopg2.pool.ThreadedConnectionPool: Connected PostgreSQL connection pool or None if connection fails
+            
+        Raises:
+            RuntimeError: If no connection string is configured for this side
+        """
+        connection_string = self._dsns[which]
+        if not connection_string and not self._use_mi:
+            raise RuntimeError(f"No {which} PostgreSQL connection string configured")
+            
         try:
             # Check existing connection health
-            if self.dest_pool and self.is_dest_healthy():
-                logger.debug("Using existing healthy destination PostgreSQL connection")
-                return self.dest_pool
-                
-            # If connection exists but is unhealthy, close it
-            if self.dest_pool and not self.is_dest_healthy():
-                logger.info("Existing destination PostgreSQL connection is unhealthy, reconnecting...")
-                try:
-                    self.dest_pool.closeall()
-                except Exception as e:
-                    logger.warning(f"Error closing unhealthy destination PostgreSQL connection: {e}")
-                self.dest_pool = None
+            if self._is_healthy(which):
+                logger.debug("Using existing healthy %s PostgreSQL connection", which)
+                return self._pools[which]
                 
-            connection_string = getattr(self.config, 'pg_dest_connection_string', None)
-            
-            # Prompt for connection string if not provided
-            if not connection_string and not getattr(self.config, 'use_managed_identity', False):
-                connection_string = self._prompt_for_connection_string("destination PostgreSQL")
-                self.config.pg_dest_connection_string = connection_string
+            # If connection exists but is unhealthy, drop it
+            if self._pools[which]:
+                logger.info("Existing %s PostgreSQL connection is unhealthy, reconnecting...", which)
+                self._reset_pool(which)
                 
-            if getattr(self.config, 'use_managed_identity', False):
-                logger.info("Connecting to destination PostgreSQL using Managed Identity")
+            if self._use_mi:
+                logger.info("Connecting to %s PostgreSQL using Managed Identity", which)
                 # For Azure PostgreSQL with Managed Identity
-                self.dest_pool = self._create_pg_pool_with_managed_identity(connection_string, "destination")
+                self._pools[which] = self._create_pg_pool_with_managed_identity(connection_string, which)
             else:
-                logger.info("Connecting to destination PostgreSQL using connection string")
-                self.dest_pool = self._create_pg_pool_with_retry(connection_string, "destination")
-                
-            # Mark as healthy after successful connection
-            with self._health_check_lock:
-                self._dest_healthy = True
+                logger.info("Connecting to %s PostgreSQL using connection string", which)
+                self._pools[which] = self._create_pg_pool_with_retry(connection_string, which)
                 
-            logger.info("Successfully connected to destination PostgreSQL instance")
-            return self.dest_pool
+            logger.info("Successfully connected to %s PostgreSQL instance", which)
+            return self._pools[which]
             
         except Exception as e:
-            logger.error(f"Failed to connect to destination PostgreSQL instance: {e}")
-            self.dest_pool = None
-            with self._health_check_lock:
-                self._dest_healthy = False
+            logger.error("Failed to connect to %s PostgreSQL instance: %s", which, e)
+            self._pools[which] = None
             return None
             
-    def _create_pg_pool_with_retry(self, connection_string, client_type="unknown"):
+    def _create_pg_pool_with_retry(self, connection_string, client_type="unknown", password_provider=None):
         """Create a PostgreSQL connection pool with comprehensive retry logic and exponential backoff.
         
         Args:
             connection_string: PostgreSQL connection string
             client_type: String identifier for logging (source/destination)
+            password_provider: Optional callable returning the password for each new connection
             
         Returns:
             psycopg2.pool.ThreadedConnectionPool: Connected PostgreSQL connection pool
@@ -213,65 +510,107 @@ class PostgreSQLConnectionManager:
             OperationalError: If connection fails after all retries
         """
         retry_attempts = self.config.connection_retry_attempts
-        base_delay_ms = self.config.connection_retry_delay_ms
+        base_delay = self.config.connection_retry_delay_ms / 1000.0
+        delay_seconds = base_delay
+        
+        logger.info("Attempting to connect to PostgreSQL %s with %s retries", client_type, retry_attempts)
+        _warn_if_leaky_libpq()
         
-        logger.info(f"Attempting to connect to PostgreSQL {client_type} with {retry_attempts} retries")
+        # Pool size: a slot for every worker plus headroom, and a few warm connections
+        # so the first workers don't queue behind cold TLS handshakes
+        workers = getattr(self.config, 'migration_workers', 1)
+        maxconn = getattr(self.config, 'pg_pool_max', None) or max(_MIN_DEFAULT_POOL_SIZE, required_pool_size(workers))
+        minconn = min(max(4, getattr(self.config, 'pg_pool_min', 5)), maxconn)
+        logger.info("PostgreSQL %s pool size: min=%s, max=%s", client_type, minconn, maxconn)
+        
+        # Server-side session settings, if any
+        session_kwargs = {}
+        session_options = getattr(self.config, 'pg_session_options', None)
+        if session_options:
+            session_kwargs["options"] = session_options
         
         for attempt in range(retry_attempts):
             try:
                 # Create connection pool with Azure PostgreSQL optimized settings
-                pool_obj = psycopg2.pool.ThreadedConnectionPool(
-                    minconn=1,
-                    maxconn=20,
+                pool_obj = _TokenConnectionPool(
+                    minconn=minconn,
+                    maxconn=maxconn,
+                    password_provider=password_provider,
                     dsn=connection_string,
                     # Connection parameters for Azure PostgreSQL
                     connect_timeout=30,
                     application_name=f"Azure_Migration_Tool_{client_type}",
                     # SSL settings for Azure PostgreSQL
                     sslmode='require',
+                    # TCP keepalives so connections dropped by the Azure gateway (idle timeout
+                    # ~4 min) fail at the socket on next use instead of hanging
+                    keepalives=1,
+                    keepalives_idle=30,
+                    keepalives_interval=10,
+                    keepalives_count=3,
+                    tcp_user_timeout=30000,
+                    **session_kwargs,
                 )
                 
-                # Test connection with a simple query
-                test_conn = pool_obj.getconn()
-                try:
-                    with test_conn.cursor() as cursor:
+                # The pool has already opened minconn connections; only the first pool for
+                # this side also round-trips for the server version string
+                pool_obj.pg_version = self._pg_versions.get(client_type)
+                if pool_obj.pg_version is None:
+                    with self._pooled_connection(pool_obj) as test_conn, test_conn.cursor() as cursor:
                         cursor.execute("SELECT version()")
                         result = cursor.fetchone()
-                        logger.info(f"Successfully connected to PostgreSQL {client_type} on attempt {attempt + 1}")
-                        logger.debug(f"PostgreSQL version: {result[0] if result else 'Unknown'}")
-                finally:
-                    pool_obj.putconn(test_conn)
+                    pool_obj.pg_version = self._pg_versions[client_type] = result[0] if result else 'Unknown'
+                logger.info("Successfully connected to PostgreSQL %s on attempt %s", client_type, attempt + 1)
+                logger.debug("PostgreSQL version: %s", pool_obj.pg_version)
                 
                 return pool_obj
                 
             except (OperationalError, DatabaseError) as e:
                 if attempt < retry_attempts - 1:
-                    # Calculate exponential backoff delay with jitter
-                    backoff_multiplier = 2 ** attempt
-                    jitter = (attempt * 0.1)  # Add small jitter to prevent thundering herd
-                    delay_seconds = (base_delay_ms / 1000.0) * backoff_multiplier + jitter
+                    # Randomized, growing delay so parallel workers don't reconnect in lockstep
+                    delay_seconds = _decorrelated_jitter(base_delay, delay_seconds)
                     
                     logger.warning(
-                        f"PostgreSQL {client_type.capitalize()} connection attempt {attempt + 1}/{retry_attempts} failed: {e}. "
-                        f"Retrying in {delay_seconds:.2f} seconds..."
+                        "PostgreSQL %s connection attempt %s/%s failed: %s. Retrying in %.2f seconds...",
+                        client_type.capitalize(), attempt + 1, retry_attempts, e, delay_seconds
                     )
                     time.sleep(delay_seconds)
                 else:
-                    logger.error(f"Failed to connect to PostgreSQL {client_type} after {retry_attempts} attempts: {e}")
+                    logger.error("Failed to connect to PostgreSQL %s after %s attempts: %s", client_type, retry_attempts, e)
                     raise OperationalError(f"Could not connect to PostgreSQL {client_type} after {retry_attempts} attempts: {e}")
                     
             except Exception as e:
-                logger.error(f"Unexpected error connecting to PostgreSQL {client_type}: {e}")
+                logger.error("Unexpected error connecting to PostgreSQL %s: %s", client_type, e)
                 if attempt < retry_attempts - 1:
-                    delay_seconds = (base_delay_ms / 1000.0) * (2 ** attempt)
-                    logger.info(f"Retrying in {delay_seconds:.2f} seconds...")
+                    delay_seconds = _decorrelated_jitter(base_delay, delay_seconds)
+                    logger.info("Retrying in %.2f seconds...", delay_seconds)
                     time.sleep(delay_seconds)
                 else:
                     raise
                     
+    def _get_pg_token(self):
+        """Return a Managed Identity access token for PostgreSQL, refreshing it when close to expiry.
+        
+        Returns:
+            str: Access token used as the connection password
+        """
+        with self._token_lock:
+            if self._token_cache["token"] and self._token_cache["expires_on"] - time.time() > 300:
+                return self._token_cache["token"]
+                
+            if self._credential is None:
+                self._credential = DefaultAzureCredential()
+            token = self._credential.get_token(_PG_TOKEN_SCOPE)
+            self._token_cache = {"token": token.token, "expires_on": token.expires_on}
+            logger.debug("Refreshed Managed Identity token for PostgreSQL")
+            return token.token
+            
     def _create_pg_pool_with_managed_identity(self, connection_string, client_type="unknown"):
         """Create a PostgreSQL connection pool using Azure Managed Identity.
         
+        The access token is passed as the password of each new connection, overriding
+        any password in the connection string, and is refreshed before it expires.
+        
         Args:
             connection_string: Base PostgreSQL connection string (without password)
             client_type: String identifier for logging (source/destination)
@@ -280,25 +619,11 @@ class PostgreSQLConnectionManager:
             psycopg2.pool.ThreadedConnectionPool: Connected PostgreSQL connection pool
         """
         try:
-            # Get Azure access token for PostgreSQL
-            credential = DefaultAzureCredential()
-            token = credential.get_token("https://ossrdbms-aad.database.windows.net/.default")
-            
-            # Parse connection string and add token as password
-            # For Azure PostgreSQL with Managed Identity, the token is used as password
-            if "password=" in connection_string:
-                # Remove existing password and replace with token
-                import re
-                connection_string = re.sub(r'password=[^;\s]*[;\s]?', '', connection_string)
-            
-            # Add token as password
-            if connection_string.endswith(';'):
-                connection_string += f"password={token.token}"
-            else:
-                connection_string += f";password={token.token}"
+            # Fail fast if no token can be obtained
+            self._get_pg_token()
             
             logger.info(f"Using Managed Identity for PostgreSQL {client_type} connection")
-            return self._create_pg_pool_with_retry(connection_string, client_type)
+            return self._create_pg_pool_with_retry(connection_string, client_type, password_provider=self._get_pg_token)
             
         except Exception as e:
             logger.error(f"Failed to authenticate with Managed Identity for PostgreSQL {client_type}: {e}")
@@ -325,23 +650,104 @@ class PostgreSQLConnectionManager:
                 return operation(*args, **kwargs)
                 
             except (OperationalError, DatabaseError) as e:
-                logger.warning(f"PostgreSQL operation failed due to connection issue (attempt {attempt + 1}/{max_retries}): {e}")
+                logger.warning("PostgreSQL operation failed due to connection issue (attempt %s/%s): %s", attempt + 1, max_retries, e)
                 
                 if attempt < max_retries - 1:
-                    # Try to reconnect
-                    if client_type == "source":
-                        logger.info("Attempting to reconnect to source PostgreSQL...")
-                        self.connect_to_source(retry_on_failure=True)
-                    elif client_type == "destination":
-                        logger.info("Attempting to reconnect to destination PostgreSQL...")
-                        self.connect_to_destination(retry_on_failure=True)
+                    # Check the pool only after a connection-level failure; rebuild it
+                    # only if the server no longer answers
+                    sides = tuple(self._pools) if client_type == "both" else (client_type,)
+                    for side in sides:
+                        if side not in self._pools:
+                            continue
+                        if isinstance(e, OperationalError) and not self._prune_pool(side):
+                            self._reset_pool(side)
+                            
+                        # Try to reconnect
+                        logger.info("Attempting to reconnect to %s PostgreSQL...", side)
+                        self._connect(side)
                     
                     # Wait before retry
-                    time.sleep(2 ** attempt)
+                    base_delay = self.config.retry_delay_ms / 1000.0
+                    time.sleep(random.uniform(base_delay, min(_MAX_RETRY_DELAY_SECONDS, base_delay * 3 ** attempt)))
                 else:
-                    logger.error(f"PostgreSQL operation failed after {max_retries} attempts: {e}")
+                    logger.error("PostgreSQL operation failed after %s attempts: %s", max_retries, e)
                     raise
                     
+    def execute_with_connection(self, operation, client_type="source", *args, **kwargs):
+        """Execute a PostgreSQL operation on a borrowed connection with automatic retry.
+        
+        The operation receives the connection as its first argument, so it does not
+        borrow from the pool itself. After an OperationalError the broken connection is
+        discarded and the next attempt borrows a fresh one; the pool is only rebuilt if
+        the server stops answering.
+        
+        Args:
+            operation: Function called as operation(conn, *args, **kwargs)
+            client_type: "source" or "destination"
+            *args: Arguments to pass to the operation
+            **kwargs: Keyword arguments to pass to the operation
+            
+        Returns:
+            Result of the operation
+            
+        Raises:
+            Exception: If operation fails after retries
+        """
+        max_retries = self.config.operation_retry_attempts
+        for attempt in range(max_retries):
+            try:
+                with self.connection(client_type) as conn:
+                    return operation(conn, *args, **kwargs)
+                    
+            except (OperationalError, DatabaseError) as e:
+                logger.warning("PostgreSQL operation failed due to connection issue (attempt %s/%s): %s", attempt + 1, max_retries, e)
+                
+                if attempt < max_retries - 1:
+                    if isinstance(e, OperationalError) and not self._prune_pool(client_type):
+                        logger.info("Attempting to reconnect to %s PostgreSQL...", client_type)
+                        self._reset_pool(client_type)
+                        self._connect(client_type)
+                            
+                    # Wait before retry
+                    base_delay = self.config.retry_delay_ms / 1000.0
+                    time.sleep(random.uniform(base_delay, min(_MAX_RETRY_DELAY_SECONDS, base_delay * 3 ** attempt)))
+                else:
+                    logger.error("PostgreSQL operation failed after %s attempts: %s", max_retries, e)
+                    raise
+                    
+    def copy_with_retry(self, client_type, sql_copy, rows, json_columns=None):
+        """Bulk load rows with a single COPY ... FROM STDIN, retrying on connection failure.
+        
+        This is the preferred path for bulk writes: one COPY replaces a round trip
+        (or an executemany page) per row.
+        
+        Args:
+            client_type: "source" or "destination"
+            sql_copy: COPY statement reading from STDIN in text format,
+                e.g. "COPY public.items (id, name) FROM STDIN"
+            rows: Iterable of row tuples in column order. Pass a list (or any
+                re-iterable) to allow retries; a one-shot iterator is tried once.
+            json_columns: Optional sequence of booleans, one per column, marking
+                json/jsonb columns whose values are serialized as JSON
+                
+        Returns:
+            int: Number of rows copied
+        """
+        def _copy_operation(conn):
+            encoding = psycopg2.extensions.encodings.get(conn.encoding, "utf-8")
+            lines = (_copy_text_line(row, json_columns).encode(encoding) for row in rows)
+            with conn.cursor() as cursor:
+                cursor.copy_expert(sql_copy, io.BufferedReader(_IteratorReader(lines), buffer_size=1 << 16))
+                count = cursor.rowcount
+            conn.commit()
+            return count
+            
+        # A consumed iterator can't be replayed, so only re-iterable input is retried
+        if iter(rows) is rows:
+            with self.connection(client_type) as conn:
+                return _copy_operation(conn)
+        return self.execute_with_connection(_copy_operation, client_type)
+        
     def _prompt_for_connection_string(self, instance_type):
         """Prompt user for PostgreSQL connection string.
         
@@ -357,39 +763,30 @@ class PostgreSQLConnectionManager:
         return getpass.getpass(f"{instance_type.capitalize()} connection string: ")
         
     def close_connections(self):
-        """Close all active PostgreSQL connections and stop health monitoring."""
-        logger.info("Closing all PostgreSQL connections...")
+        """Close all active PostgreSQL connections.
         
-        # Stop health monitoring
-        self._shutdown_requested = True
+        Both pools are closed in parallel, and the call returns after at most
+        10 seconds even if a server is slow to acknowledge the disconnects.
+        """
+        logger.info("Closing all PostgreSQL connections...")
         
-        if self.source_pool:
+        def _close_pool(which, pool_obj):
             try:
-                logger.info("Closing source PostgreSQL connection pool")
-                self.source_pool.closeall()
-                with self._health_check_lock:
-                    self._source_healthy = False
+                logger.info(f"Closing {which} PostgreSQL connection pool")
+                pool_obj.closeall()
             except Exception as e:
-                logger.warning(f"Error closing source PostgreSQL connection pool: {e}")
-            finally:
-                self.source_pool = None
-            
-        if self.dest_pool:
-            try:
-                logger.info("Closing destination PostgreSQL connection pool")
-                self.dest_pool.closeall()
-                with self._health_check_lock:
-                    self._dest_healthy = False
-            except Exception as e:
-                logger.warning(f"Error closing destination PostgreSQL connection pool: {e}")
-            finally:
-                self.dest_pool = None
+                logger.warning(f"Error closing {which} PostgreSQL connection pool: {e}")
                 
-        # Wait for health monitor thread to finish
-        try:
-            if self._health_monitor_thread.is_alive():
-                self._health_monitor_thread.join(timeout=5)
-        except Exception as e:
-            logger.warning(f"Error stopping PostgreSQL health monitor thread: {e}")
+        pools = [(which, pool_obj) for which, pool_obj in self._pools.items() if pool_obj]
+        for which, _ in pools:
+            self._pools[which] = None
             
+        if pools:
+            executor = ThreadPoolExecutor(max_workers=len(pools), thread_name_prefix="pg-close")
+            futures = [executor.submit(_close_pool, which, pool_obj) for which, pool_obj in pools]
+            _, pending = wait(futures, timeout=10)
+            if pending:
+                logger.warning("Timed out waiting for PostgreSQL connection pools to close")
+            executor.shutdown(wait=False)
+                
         logger.info("All PostgreSQL connections closed successfully")
@@ -3,16 +3,57 @@ PostgreSQL migration service for Azure Database Migration Tool.
 Implements schema and data migration between PostgreSQL databases.
 """
 
+import io
 import logging
+import os
+import queue
+import threading
 import time
 import traceback
+import uuid
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import psycopg2
 from psycopg2 import sql, OperationalError, DatabaseError
-from psycopg2.extras import execute_batch
+from psycopg2.errors import FeatureNotSupported, WrongObjectType
+from psycopg2.extras import execute_values
 from tqdm import tqdm
 
+try:
+    # Try relative import first (when running as module)
+    from .postgresql_connection_manager import _copy_text_line, required_pool_size, POOL_HEADROOM
+except ImportError:
+    # Fall back to absolute import (when running directly)
+    from postgresql_connection_manager import _copy_text_line, required_pool_size, POOL_HEADROOM
+
 logger = logging.getLogger(__name__)
 
+# Auto-sized batches aim for this many bytes of row data, within the row-count bounds
+_TARGET_BATCH_BYTES = 8 * 1024 * 1024
+_MIN_AUTO_BATCH_ROWS = 500
+_MAX_AUTO_BATCH_ROWS = 50000
+
+# Tables estimated below this many rows are copied sequentially: the direct COPY pipe
+# beats splitting them into key ranges
+_PARALLEL_MIN_ROWS = 100000
+
+
+def _rows_to_copy_buffer(rows, json_columns=None):
+    """Render rows as a COPY text-format buffer (tab separated, NULL as \\N).
+    
+    Args:
+        rows: Sequence of row tuples in column order
+        json_columns: Optional sequence of booleans, one per column, marking json/jsonb columns
+        
+    Returns:
+        io.StringIO: Buffer positioned at the start, ready for cursor.copy_expert
+    """
+    buf = io.StringIO()
+    buf.writelines(_copy_text_line(row, json_columns) for row in rows)
+    buf.seek(0)
+    return buf
+
+
 class PostgreSQLMigrationService:
     """Service to handle migration of schemas and data between PostgreSQL instances."""
     
@@ -31,7 +72,89 @@ class PostgreSQLMigrationService:
         self.config = config
         self.connection_manager = connection_manager
         self.batch_size = batch_size
+        self.auto_batch_size = True  # Size batches per table from its average row width
+        # Older config objects may predate these settings, so fall back to the Config defaults
+        self.bulk_mode = getattr(config, 'pg_bulk_mode', False)
+        self.unlogged_load = getattr(config, 'pg_unlogged_load', False)
+        self.direct_copy = True  # Pipe COPY TO STDOUT into COPY FROM STDIN, skipping row objects
+        self._use_copy = {}  # (schema, table) -> False once COPY was refused for that target
+        self._prepared_stmts = {}  # (schema, table, columns) -> statements composed once per table
+        self.migration_workers = max(1, getattr(config, 'migration_workers', 1))
+        self._check_pool_capacity(self.migration_workers)
+        
+    def _check_pool_capacity(self, workers):
+        """Warn when a pool is too small for the configured parallelism.
+        
+        An undersized pool makes workers queue for connections, which is slower
+        than running fewer workers.
+        """
+        recommended = required_pool_size(workers)
+        for which, pool_obj in (("source", self.source_pool), ("destination", self.dest_pool)):
+            maxconn = getattr(pool_obj, "maxconn", None)
+            if maxconn is not None and maxconn < recommended:
+                logger.warning(f"PostgreSQL {which} pool allows {maxconn} connections, but {workers} "
+                              f"workers need about {recommended}; raise PG_POOL_MAX to {recommended} "
+                              f"or lower MIGRATION_WORKERS")
+                
+    @contextmanager
+    def _borrow(self, which, conn=None):
+        """Borrow a pooled connection for the duration of a block.
+        
+        Args:
+            which: "source" or "destination"
+            conn: Connection already held by the caller; yielded as-is and not
+                returned to the pool, so helpers can share one checkout
+                
+        Yields:
+            connection: psycopg2 connection
+        """
+        if conn is not None:
+            yield conn
+            return
+        pool_obj = self.source_pool if which == "source" else self.dest_pool
+        conn = pool_obj.getconn()
+        try:
+            yield conn
+        finally:
+            pool_obj.putconn(conn)
+            
+    def _iter_rows(self, conn, query, params=None):
+        """Iterate over a query's rows through a server-side cursor.
+        
+        Rows are fetched from the server a page at a time (cursor.itersize), so
+        large catalog scans don't have to fit in memory at once.
+        
+        Args:
+            conn: Connection to run the query on
+            query: SQL query
+            params: Query parameters
+            
+        Yields:
+            tuple: Result rows
+        """
+        with conn.cursor(name=f"rows_{uuid.uuid4().hex}") as cursor:
+            cursor.execute(query, params)
+            yield from cursor
+            
+    def iter_databases(self):
+        """Iterate over the databases in the source PostgreSQL instance.
+        
+        Rows are streamed from a server-side cursor; use list_databases for a list.
         
+        Yields:
+            str: Database name
+        """
+        with self._borrow("source") as conn:
+            # Get databases excluding system databases
+            for row in self._iter_rows(conn, """
+                SELECT datname 
+                FROM pg_database 
+                WHERE datistemplate = false 
+                AND datname NOT IN ('postgres', 'template0', 'template1', 'azure_maintenance')
+                ORDER BY datname
+            """):
+                yield row[0]
+                
     def list_databases(self):
         """List all databases in the source PostgreSQL instance.
         
@@ -39,21 +162,7 @@ class PostgreSQLMigrationService:
             list: List of database names
         """
         def _list_databases_operation():
-            conn = self.source_pool.getconn()
-            try:
-                with conn.cursor() as cursor:
-                    # Get databases excluding system databases
-                    cursor.execute("""
-                        SELECT datname 
-                        FROM pg_database 
-                        WHERE datistemplate = false 
-                        AND datname NOT IN ('postgres', 'template0', 'template1', 'azure_maintenance')
-                        ORDER BY datname
-                    """)
-                    databases = [row[0] for row in cursor.fetchall()]
-                    return databases
-            finally:
-                self.source_pool.putconn(conn)
+            return list(self.iter_databases())
         
         try:
             if self.connection_manager:
@@ -64,6 +173,27 @@ class PostgreSQLMigrationService:
             logger.error(f"Error listing PostgreSQL databases: {e}")
             return []
             
+    def iter_schemas(self, database_name=None):
+        """Iterate over the schemas in the source database.
+        
+        Rows are streamed from a server-side cursor; use list_schemas for a list.
+        
+        Args:
+            database_name: Name of the database (if None, uses current connection)
+            
+        Yields:
+            str: Schema name
+        """
+        with self._borrow("source") as conn:
+            # Get schemas excluding system schemas
+            for row in self._iter_rows(conn, """
+                SELECT schema_name 
+                FROM information_schema.schemata 
+                WHERE schema_name NOT IN ('information_schema', 'pg_catalog', 'pg_toast', 'pg_temp_1', 'pg_toast_temp_1')
+                ORDER BY schema_name
+            """):
+                yield row[0]
+                
     def list_schemas(self, database_name=None):
         """List all schemas in the source database.
         
@@ -74,20 +204,7 @@ class PostgreSQLMigrationService:
             list: List of schema names
         """
         def _list_schemas_operation():
-            conn = self.source_pool.getconn()
-            try:
-                with conn.cursor() as cursor:
-                    # Get schemas excluding system schemas
-                    cursor.execute("""
-                        SELECT schema_name 
-                        FROM information_schema.schemata 
-                        WHERE schema_name NOT IN ('information_schema', 'pg_catalog', 'pg_toast', 'pg_temp_1', 'pg_toast_temp_1')
-                        ORDER BY schema_name
-                    """)
-                    schemas = [row[0] for row in cursor.fetchall()]
-                    return schemas
-            finally:
-                self.source_pool.putconn(conn)
+            return list(self.iter_schemas(database_name))
         
         try:
             if self.connection_manager:
@@ -98,6 +215,36 @@ class PostgreSQLMigrationService:
             logger.error(f"Error listing PostgreSQL schemas: {e}")
             return []
             
+    def iter_tables(self, schema_name='public'):
+        """Iterate over the tables in a schema.
+        
+        Rows are streamed from a server-side cursor; use list_tables for a list.
+        
+        Args:
+            schema_name: Name of the schema
+            
+        Yields:
+            dict: Table name, estimated row count and schema
+        """
+        with self._borrow("source") as conn:
+            # Get tables with row counts
+            for row in self._iter_rows(conn, """
+                SELECT 
+                    t.table_name,
+                    COALESCE(c.reltuples::bigint, 0) as estimated_rows
+                FROM information_schema.tables t
+                LEFT JOIN pg_class c ON c.relname = t.table_name
+                LEFT JOIN pg_namespace n ON n.oid = c.relnamespace AND n.nspname = t.table_schema
+                WHERE t.table_schema = %s 
+                AND t.table_type = 'BASE TABLE'
+                ORDER BY t.table_name
+            """, (schema_name,)):
+                yield {
+                    'name': row[0],
+                    'estimated_rows': row[1],
+                    'schema': schema_name
+                }
+                
     def list_tables(self, schema_name='public'):
         """List all tables in a schema.
         
@@ -108,32 +255,7 @@ class PostgreSQLMigrationService:
             list: List of table names with metadata
         """
         def _list_tables_operation():
-            conn = self.source_pool.getconn()
-            try:
-                with conn.cursor() as cursor:
-                    # Get tables with row counts
-                    cursor.execute("""
-                        SELECT 
-                            t.table_name,
-                            COALESCE(c.reltuples::bigint, 0) as estimated_rows
-                        FROM information_schema.tables t
-                        LEFT JOIN pg_class c ON c.relname = t.table_name
-                        LEFT JOIN pg_namespace n ON n.oid = c.relnamespace AND n.nspname = t.table_schema
-                        WHERE t.table_schema = %s 
-                        AND t.table_type = 'BASE TABLE'
-                        ORDER BY t.table_name
-                    """, (schema_name,))
-                    
-                    tables = []
-                    for row in cursor.fetchall():
-                        tables.append({
-                            'name': row[0],
-                            'estimated_rows': row[1],
-                            'schema': schema_name
-                        })
-                    return tables
-            finally:
-                self.source_pool.putconn(conn)
+            return list(self.iter_tables(schema_name))
         
         try:
             if self.connection_manager:
@@ -144,19 +266,19 @@ class PostgreSQLMigrationService:
             logger.error(f"Error listing PostgreSQL tables for schema {schema_name}: {e}")
             return []
             
-    def get_table_count(self, schema_name, table_name):
+    def get_table_count(self, schema_name, table_name, source_conn=None):
         """Get the exact count of records in a table.
         
         Args:
             schema_name: Name of the schema
             table_name: Name of the table
+            source_conn: Source connection to reuse instead of borrowing one
             
         Returns:
             int: Number of records in the table
         """
         def _count_operation():
-            conn = self.source_pool.getconn()
-            try:
+            with self._borrow("source", source_conn) as conn:
                 with conn.cursor() as cursor:
                     cursor.execute(
                         sql.SQL("SELECT COUNT(*) FROM {}.{}").format(
@@ -165,11 +287,9 @@ class PostgreSQLMigrationService:
                         )
                     )
                     return cursor.fetchone()[0]
-            finally:
-                self.source_pool.putconn(conn)
         
         try:
-            if self.connection_manager:
+            if self.connection_manager and source_conn is None:
                 return self.connection_manager.execute_with_retry(_count_operation, "source")
             else:
                 return _count_operation()
@@ -180,6 +300,10 @@ class PostgreSQLMigrationService:
     def migrate_schema(self, schema_name='public'):
         """Migrate schema structure from source to destination.
         
+        Runs the pre-data and post-data phases back to back, for schema-only
+        migrations. When data is migrated too, use migrate_schema_and_data so
+        indexes and foreign keys are built after the load.
+        
         Args:
             schema_name: Name of the schema to migrate
             
@@ -189,11 +313,51 @@ class PostgreSQLMigrationService:
         try:
             logger.info(f"Starting schema migration for: {schema_name}")
             
+            schema_ddl = self._extract_schema_ddl(schema_name)
+            pre_stats = self.migrate_schema_pre_data(schema_name, schema_ddl)
+            if not pre_stats["success"]:
+                return pre_stats
+            post_stats = self.migrate_schema_post_data(schema_name, schema_ddl)
+            
+            stats = {
+                "success": post_stats["success"],
+                "schema_name": schema_name,
+                "tables_created": pre_stats["tables_created"],
+                "indexes_created": post_stats.get("indexes_created", 0),
+                "constraints_created": pre_stats["constraints_created"] + post_stats.get("constraints_created", 0),
+                "errors": pre_stats["errors"] + post_stats["errors"]
+            }
+            
+            logger.info(f"Schema migration completed. Stats: {stats}")
+            return stats
+            
+        except Exception as e:
+            logger.error(f"Error migrating schema {schema_name}: {e}")
+            logger.debug(traceback.format_exc())
+            return {
+                "success": False,
+                "schema_name": schema_name,
+                "error": str(e),
+                "errors": [str(e)]
+            }
+            
+    def migrate_schema_pre_data(self, schema_name='public', schema_ddl=None):
+        """Create the schema, its tables and their primary keys on the destination.
+        
+        Args:
+            schema_name: Name of the schema to migrate
+            schema_ddl: DDL from _extract_schema_ddl (extracted if not given)
+            
+        Returns:
+            dict: Migration statistics
+        """
+        try:
+            logger.info(f"Starting pre-data schema migration for: {schema_name}")
+            
             stats = {
                 "success": True,
                 "schema_name": schema_name,
                 "tables_created": 0,
-                "indexes_created": 0,
                 "constraints_created": 0,
                 "errors": []
             }
@@ -202,42 +366,109 @@ class PostgreSQLMigrationService:
             self._create_schema_if_not_exists(schema_name)
             
             # Step 2: Get schema structure
-            schema_ddl = self._extract_schema_ddl(schema_name)
+            if schema_ddl is None:
+                schema_ddl = self._extract_schema_ddl(schema_name)
             
             # Step 3: Create tables
-            for table_ddl in schema_ddl['tables']:
-                try:
-                    self._execute_ddl(table_ddl)
+            for table_ddl, error in self._execute_ddl_bulk(schema_ddl['tables']):
+                if error is None:
                     stats["tables_created"] += 1
                     logger.info(f"Created table: {table_ddl['table_name']}")
-                except Exception as e:
-                    error_msg = f"Failed to create table {table_ddl['table_name']}: {e}"
+                else:
+                    error_msg = f"Failed to create table {table_ddl['table_name']}: {error}"
                     logger.error(error_msg)
                     stats["errors"].append(error_msg)
             
-            # Step 4: Create indexes
-            for index_ddl in schema_ddl['indexes']:
-                try:
-                    self._execute_ddl(index_ddl)
+            # Step 4: Create primary keys
+            primary_keys = [c for c in schema_ddl['constraints'] if c['phase'] == 'pre_data']
+            for constraint_ddl, error in self._execute_ddl_bulk(primary_keys):
+                if error is None:
+                    stats["constraints_created"] += 1
+                    logger.debug(f"Created constraint: {constraint_ddl['constraint_name']}")
+                else:
+                    error_msg = f"Failed to create constraint {constraint_ddl['constraint_name']}: {error}"
+                    logger.warning(error_msg)
+                    stats["errors"].append(error_msg)
+            
+            logger.info(f"Pre-data schema migration completed. Stats: {stats}")
+            return stats
+            
+        except Exception as e:
+            logger.error(f"Error migrating schema {schema_name}: {e}")
+            logger.debug(traceback.format_exc())
+            return {
+                "success": False,
+                "schema_name": schema_name,
+                "error": str(e),
+                "errors": [str(e)]
+            }
+            
+    def migrate_schema_post_data(self, schema_name='public', schema_ddl=None):
+        """Create indexes, unique constraints and foreign keys on the destination.
+        
+        Indexes are built one per transaction with parallel maintenance workers,
+        since nothing else writes to the freshly loaded tables. Foreign keys are
+        added NOT VALID and then validated, so the check doesn't hold an
+        exclusive lock for its whole duration.
+        
+        Args:
+            schema_name: Name of the schema to migrate
+            schema_ddl: DDL from _extract_schema_ddl (extracted if not given)
+            
+        Returns:
+            dict: Migration statistics
+        """
+        try:
+            logger.info(f"Starting post-data schema migration for: {schema_name}")
+            
+            stats = {
+                "success": True,
+                "schema_name": schema_name,
+                "indexes_created": 0,
+                "constraints_created": 0,
+                "constraints_validated": 0,
+                "errors": []
+            }
+            
+            if schema_ddl is None:
+                schema_ddl = self._extract_schema_ddl(schema_name)
+            
+            # Step 1: Create indexes
+            for index_ddl, error in self._build_indexes(schema_ddl['indexes']):
+                if error is None:
                     stats["indexes_created"] += 1
                     logger.debug(f"Created index: {index_ddl['index_name']}")
-                except Exception as e:
-                    error_msg = f"Failed to create index {index_ddl['index_name']}: {e}"
+                else:
+                    error_msg = f"Failed to create index {index_ddl['index_name']}: {error}"
                     logger.warning(error_msg)
                     stats["errors"].append(error_msg)
             
-            # Step 5: Create constraints
-            for constraint_ddl in schema_ddl['constraints']:
-                try:
-                    self._execute_ddl(constraint_ddl)
+            # Step 2: Create unique and foreign key constraints
+            constraints = [c for c in schema_ddl['constraints'] if c['phase'] == 'post_data']
+            for constraint_ddl, error in self._execute_ddl_bulk(constraints):
+                if error is None:
                     stats["constraints_created"] += 1
                     logger.debug(f"Created constraint: {constraint_ddl['constraint_name']}")
-                except Exception as e:
-                    error_msg = f"Failed to create constraint {constraint_ddl['constraint_name']}: {e}"
+                else:
+                    error_msg = f"Failed to create constraint {constraint_ddl['constraint_name']}: {error}"
                     logger.warning(error_msg)
                     stats["errors"].append(error_msg)
             
-            logger.info(f"Schema migration completed. Stats: {stats}")
+            # Step 3: Validate the foreign keys that were added NOT VALID
+            validations = [
+                {'constraint_name': c['constraint_name'], 'ddl': c['validate_ddl']}
+                for c in constraints if c.get('validate_ddl')
+            ]
+            for validation, error in self._execute_ddl_bulk(validations):
+                if error is None:
+                    stats["constraints_validated"] += 1
+                    logger.debug(f"Validated constraint: {validation['constraint_name']}")
+                else:
+                    error_msg = f"Failed to validate constraint {validation['constraint_name']}: {error}"
+                    logger.warning(error_msg)
+                    stats["errors"].append(error_msg)
+            
+            logger.info(f"Post-data schema migration completed. Stats: {stats}")
             return stats
             
         except Exception as e:
@@ -250,12 +481,83 @@ class PostgreSQLMigrationService:
                 "errors": [str(e)]
             }
             
-    def migrate_table_data(self, schema_name, table_name):
+    def migrate_schema_and_data(self, schema_name='public'):
+        """Migrate a schema's structure and data, loading rows before indexes exist.
+        
+        Tables and primary keys are created first, every table is copied into
+        its unindexed destination, and the remaining indexes and constraints are
+        built at the end. With more than one migration worker, large tables are
+        copied as parallel primary-key ranges.
+        
+        Args:
+            schema_name: Name of the schema to migrate
+            
+        Returns:
+            dict: Migration statistics with per-phase and per-table results
+        """
+        logger.info(f"Starting schema and data migration for: {schema_name}")
+        
+        stats = {
+            "success": True,
+            "schema_name": schema_name,
+            "pre_data": None,
+            "tables": [],
+            "post_data": None,
+            "errors": []
+        }
+        
+        try:
+            schema_ddl = self._extract_schema_ddl(schema_name)
+        except Exception as e:
+            logger.error(f"Error extracting schema {schema_name}: {e}")
+            stats["success"] = False
+            stats["errors"].append(str(e))
+            return stats
+            
+        stats["pre_data"] = self.migrate_schema_pre_data(schema_name, schema_ddl)
+        stats["errors"].extend(stats["pre_data"]["errors"])
+        if not stats["pre_data"]["success"]:
+            stats["success"] = False
+            return stats
+            
+        # Column lists and row estimates for every table in two catalog queries
+        try:
+            metadata = self._prefetch_schema_metadata(schema_name)
+        except Exception as e:
+            logger.warning(f"Could not prefetch table metadata for {schema_name}, "
+                          f"querying per table: {e}")
+            metadata = {}
+            
+        for table_ddl in schema_ddl['tables']:
+            table_metadata = metadata.get(table_ddl['table_name'])
+            if self.migration_workers > 1 and table_metadata and table_metadata['count'] >= _PARALLEL_MIN_ROWS:
+                table_stats = self.migrate_table_data_parallel(schema_name, table_ddl['table_name'],
+                                                               metadata=table_metadata)
+            else:
+                table_stats = self.migrate_table_data(schema_name, table_ddl['table_name'], table_metadata)
+            stats["tables"].append(table_stats)
+            if not table_stats["success"]:
+                stats["success"] = False
+                stats["errors"].append(table_stats.get("error", f"Failed to migrate {table_ddl['table_name']}"))
+                
+        stats["post_data"] = self.migrate_schema_post_data(schema_name, schema_ddl)
+        stats["errors"].extend(stats["post_data"]["errors"])
+        if not stats["post_data"]["success"]:
+            stats["success"] = False
+            
+        logger.info(f"Schema and data migration completed for {schema_name}. "
+                   f"Tables: {len(stats['tables'])}, Errors: {len(stats['errors'])}")
+        return stats
+        
+    def migrate_table_data(self, schema_name, table_name, metadata=None):
         """Migrate data from a source table to destination table.
         
         Args:
             schema_name: Name of the schema
             table_name: Name of the table
+            metadata: Optional entry from _prefetch_schema_metadata for this table.
+                Its columns are used as-is, and its estimated row count replaces
+                the exact COUNT(*) (total_records is then the number of rows read)
             
         Returns:
             dict: Migration statistics
@@ -263,13 +565,141 @@ class PostgreSQLMigrationService:
         try:
             logger.info(f"Starting data migration for: {schema_name}.{table_name}")
             
-            # Get table structure for column mapping
-            columns = self._get_table_columns(schema_name, table_name)
+            # One source checkout covers the metadata queries and the table scan
+            with self._borrow("source") as source_conn:
+                return self._migrate_table_data_on(schema_name, table_name, source_conn, metadata)
+                
+        except Exception as e:
+            logger.error(f"Error migrating table data {schema_name}.{table_name}: {e}")
+            logger.debug(traceback.format_exc())
+            return {
+                "success": False,
+                "schema_name": schema_name,
+                "table_name": table_name,
+                "error": str(e)
+            }
+            
+    def _migrate_table_data_on(self, schema_name, table_name, source_conn, metadata=None):
+        """Migrate a table's data using a source connection held by the caller."""
+        # Get table structure for column mapping
+        if metadata:
+            columns = metadata['columns']
+        else:
+            columns = self._get_table_columns(schema_name, table_name, source_conn)
+        if not columns:
+            raise Exception(f"Could not retrieve column information for {schema_name}.{table_name}")
+        
+        # Count total records (an estimate is enough to size the progress bar)
+        if metadata:
+            total_records = metadata['count']
+        else:
+            total_records = self.get_table_count(schema_name, table_name, source_conn)
+        
+        stats = {
+            "success": True,
+            "schema_name": schema_name,
+            "table_name": table_name,
+            "total_records": total_records,
+            "migrated_records": 0,
+            "failed_records": 0,
+            "start_time": time.time()
+        }
+        
+        if total_records == 0 and not metadata:
+            logger.info(f"Table {schema_name}.{table_name} is empty, nothing to migrate")
+            return stats
+        
+        # Create progress bar
+        progress_bar = tqdm(total=total_records or None, desc=f"Migrating {schema_name}.{table_name}")
+        
+        # Skip WAL for the load; the table is made durable again once its data is in
+        unlogged = self.unlogged_load and self._set_table_logged(schema_name, table_name, False)
+        
+        try:
+            copied = None
+            if self.direct_copy:
+                try:
+                    copied = self._copy_table_direct(schema_name, table_name, columns, source_conn)
+                except OperationalError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Direct COPY of {schema_name}.{table_name} failed, "
+                                  f"falling back to batched copy: {e}")
+                    
+            if copied is not None:
+                stats["migrated_records"] += copied
+                progress_bar.update(copied)
+            else:
+                batch_size = self._table_batch_size(schema_name, table_name, source_conn)
+                self._copy_table_batched(schema_name, table_name, columns, stats, progress_bar,
+                                         source_conn, batch_size)
+        finally:
+            progress_bar.close()
+            if unlogged:
+                self._set_table_logged(schema_name, table_name, True)
+            
+        if metadata:
+            stats["total_records"] = stats["migrated_records"] + stats["failed_records"]
+        stats["end_time"] = time.time()
+        stats["duration"] = stats["end_time"] - stats["start_time"]
+        
+        logger.info(f"Data migration completed for {schema_name}.{table_name}. "
+                   f"Migrated: {stats['migrated_records']}, Failed: {stats['failed_records']}, "
+                   f"Duration: {stats['duration']:.2f}s")
+        
+        return stats
+        
+    def migrate_table_data_parallel(self, schema_name, table_name, num_workers=None, metadata=None):
+        """Migrate a table by copying primary-key ranges on several workers at once.
+        
+        The primary key is sampled into non-overlapping ranges, and each range is
+        streamed and COPYed on its own source and destination connections. Tables
+        without a single-column primary key are migrated sequentially.
+        
+        Args:
+            schema_name: Name of the schema
+            table_name: Name of the table
+            num_workers: Number of concurrent range copies (default: migration_workers,
+                capped by the connection pool sizes)
+            metadata: Optional entry from _prefetch_schema_metadata, passed on when
+                the table falls back to a sequential copy
+            
+        Returns:
+            dict: Migration statistics
+        """
+        if num_workers is None:
+            pool_capacity = min(self.source_pool.maxconn, self.dest_pool.maxconn) - POOL_HEADROOM
+            num_workers = min(self.migration_workers, pool_capacity)
+        if num_workers <= 1:
+            return self.migrate_table_data(schema_name, table_name, metadata)
+            
+        try:
+            # One source checkout covers all the metadata queries
+            with self._borrow("source") as source_conn:
+                primary_key = self._get_primary_key_columns(schema_name, table_name, source_conn)
+                key_column = primary_key[0] if len(primary_key) == 1 else None
+                boundaries = None
+                if key_column:
+                    boundaries = self._sample_key_boundaries(schema_name, table_name, key_column,
+                                                             num_workers, source_conn)
+                if boundaries:
+                    columns = self._get_table_columns(schema_name, table_name, source_conn)
+                    total_records = self.get_table_count(schema_name, table_name, source_conn)
+                    batch_size = self._table_batch_size(schema_name, table_name, source_conn)
+                    
+            if key_column is None:
+                logger.info(f"{schema_name}.{table_name} has no single-column primary key, "
+                           f"migrating sequentially")
+                return self.migrate_table_data(schema_name, table_name, metadata)
+            if boundaries is None:
+                logger.info(f"Could not split {schema_name}.{table_name} on {key_column}, "
+                           f"migrating sequentially")
+                return self.migrate_table_data(schema_name, table_name, metadata)
             if not columns:
                 raise Exception(f"Could not retrieve column information for {schema_name}.{table_name}")
-            
-            # Count total records
-            total_records = self.get_table_count(schema_name, table_name)
+                
+            logger.info(f"Starting parallel data migration for: {schema_name}.{table_name} "
+                       f"({len(boundaries) + 1} ranges on {key_column}, {num_workers} workers)")
             
             stats = {
                 "success": True,
@@ -278,36 +708,59 @@ class PostgreSQLMigrationService:
                 "total_records": total_records,
                 "migrated_records": 0,
                 "failed_records": 0,
+                "errors": [],
                 "start_time": time.time()
             }
             
             if total_records == 0:
                 logger.info(f"Table {schema_name}.{table_name} is empty, nothing to migrate")
                 return stats
-            
-            # Create progress bar
+                
+            # Half-open ranges [lo, hi); the first and last are unbounded
+            key = sql.Identifier(key_column)
+            bounds = [None] + boundaries + [None]
+            ranges = []
+            for lo, hi in zip(bounds, bounds[1:]):
+                if lo is None:
+                    ranges.append((sql.SQL("{} < %s").format(key), (hi,)))
+                elif hi is None:
+                    ranges.append((sql.SQL("{} >= %s").format(key), (lo,)))
+                else:
+                    ranges.append((sql.SQL("{} >= %s AND {} < %s").format(key, key), (lo, hi)))
+                    
+            stats_lock = threading.Lock()
+            unlogged = self.unlogged_load and self._set_table_logged(schema_name, table_name, False)
             progress_bar = tqdm(total=total_records, desc=f"Migrating {schema_name}.{table_name}")
             
-            # Process data in batches
-            offset = 0
-            while offset < total_records:
-                try:
-                    batch_stats = self._migrate_data_batch(schema_name, table_name, columns, offset)
-                    stats["migrated_records"] += batch_stats["inserted"]
-                    stats["failed_records"] += batch_stats["failed"]
-                    progress_bar.update(batch_stats["processed"])
-                    offset += self.batch_size
-                    
-                except Exception as e:
-                    logger.error(f"Error migrating batch at offset {offset}: {e}")
-                    stats["failed_records"] += self.batch_size
-                    offset += self.batch_size
-                    
-            progress_bar.close()
+            def _migrate_range(where, params):
+                for batch_data in self._iter_source_batches(schema_name, table_name, columns, where, params,
+                                                             order_by=key_column, batch_size=batch_size):
+                    batch_stats = self._copy_batch_to_destination(schema_name, table_name, columns, batch_data)
+                    with stats_lock:
+                        stats["migrated_records"] += batch_stats["inserted"]
+                        stats["failed_records"] += batch_stats["failed"]
+                        progress_bar.update(batch_stats["processed"])
+                        
+            try:
+                with ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="pg-range") as executor:
+                    futures = {executor.submit(_migrate_range, where, params): params for where, params in ranges}
+                    for future in as_completed(futures):
+                        try:
+                            future.result()
+                        except Exception as e:
+                            error_msg = f"Failed to migrate {schema_name}.{table_name} range {futures[future]}: {e}"
+                            logger.error(error_msg)
+                            stats["errors"].append(error_msg)
+                            stats["success"] = False
+            finally:
+                progress_bar.close()
+                if unlogged:
+                    self._set_table_logged(schema_name, table_name, True)
+                
             stats["end_time"] = time.time()
             stats["duration"] = stats["end_time"] - stats["start_time"]
             
-            logger.info(f"Data migration completed for {schema_name}.{table_name}. "
+            logger.info(f"Parallel data migration completed for {schema_name}.{table_name}. "
                        f"Migrated: {stats['migrated_records']}, Failed: {stats['failed_records']}, "
                        f"Duration: {stats['duration']:.2f}s")
             
@@ -343,147 +796,168 @@ class PostgreSQLMigrationService:
         else:
             _create_schema_operation()
             
-    def _extract_schema_ddl(self, schema_name):
+    def _extract_schema_ddl(self, schema_name, source_conn=None):
         """Extract DDL statements for schema objects."""
         def _extract_ddl_operation():
-            conn = self.source_pool.getconn()
-            try:
-                with conn.cursor() as cursor:
-                    schema_ddl = {
-                        'tables': [],
-                        'indexes': [],
-                        'constraints': []
-                    }
-                    
-                    # Get table DDL
-                    cursor.execute("""
-                        SELECT 
-                            table_name,
-                            column_name,
-                            data_type,
-                            character_maximum_length,
-                            numeric_precision,
-                            numeric_scale,
-                            is_nullable,
-                            column_default,
-                            ordinal_position
-                        FROM information_schema.columns 
-                        WHERE table_schema = %s 
-                        ORDER BY table_name, ordinal_position
-                    """, (schema_name,))
+            with self._borrow("source", source_conn) as conn:
+                schema_ddl = {
+                    'tables': [],
+                    'indexes': [],
+                    'constraints': []
+                }
+                
+                # Get table DDL
+                rows = self._iter_rows(conn, """
+                    SELECT 
+                        table_name,
+                        column_name,
+                        data_type,
+                        character_maximum_length,
+                        numeric_precision,
+                        numeric_scale,
+                        is_nullable,
+                        column_default,
+                        ordinal_position
+                    FROM information_schema.columns 
+                    WHERE table_schema = %s 
+                    ORDER BY table_name, ordinal_position
+                """, (schema_name,))
+                
+                tables = {}
+                for row in rows:
+                    table_name = row[0]
+                    if table_name not in tables:
+                        tables[table_name] = {
+                            'table_name': table_name,
+                            'columns': [],
+                            'ddl': None,
+                            'phase': 'pre_data'
+                        }
                     
-                    tables = {}
-                    for row in cursor.fetchall():
-                        table_name = row[0]
-                        if table_name not in tables:
-                            tables[table_name] = {
-                                'table_name': table_name,
-                                'columns': [],
-                                'ddl': None
-                            }
-                        
-                        # Build column definition
-                        col_def = f"{row[1]} {row[2]}"
-                        if row[3]:  # character_maximum_length
-                            col_def += f"({row[3]})"
-                        elif row[4] and row[5]:  # numeric_precision and scale
-                            col_def += f"({row[4]},{row[5]})"
-                        elif row[4]:  # numeric_precision only
-                            col_def += f"({row[4]})"
-                        
-                        if row[6] == 'NO':  # is_nullable
-                            col_def += " NOT NULL"
-                        
-                        if row[7]:  # column_default
-                            col_def += f" DEFAULT {row[7]}"
-                        
-                        tables[table_name]['columns'].append(col_def)
+                    # Build column definition (precision only applies to numeric types;
+                    # integer columns also report one)
+                    data_type = row[2]
+                    if row[3]:  # character_maximum_length
+                        data_type = f"{row[2]}({row[3]})"
+                    elif row[2] in ('numeric', 'decimal') and row[4] and row[5]:  # precision and scale
+                        data_type = f"{row[2]}({row[4]},{row[5]})"
+                    elif row[2] in ('numeric', 'decimal') and row[4]:  # precision only
+                        data_type = f"{row[2]}({row[4]})"
                     
-                    # Generate CREATE TABLE statements
-                    for table_name, table_info in tables.items():
-                        ddl = f"CREATE TABLE IF NOT EXISTS {schema_name}.{table_name} (\\n"
-                        ddl += ",\\n".join(f"  {col}" for col in table_info['columns'])
-                        ddl += "\\n)"
-                        table_info['ddl'] = ddl
-                        schema_ddl['tables'].append(table_info)
+                    col_def = [sql.Identifier(row[1]), sql.SQL(data_type)]
+                    if row[6] == 'NO':  # is_nullable
+                        col_def.append(sql.SQL("NOT NULL"))
                     
-                    # Get indexes (excluding primary key and unique constraints)
-                    cursor.execute("""
-                        SELECT 
-                            i.indexname as index_name,
-                            i.tablename as table_name,
-                            i.indexdef as index_definition
-                        FROM pg_indexes i
-                        WHERE i.schemaname = %s
-                        AND i.indexdef NOT LIKE '%%UNIQUE%%'
-                        AND i.indexname NOT LIKE '%%_pkey'
-                    """, (schema_name,))
+                    if row[7]:  # column_default
+                        col_def.append(sql.SQL(f"DEFAULT {row[7]}"))
                     
-                    for row in cursor.fetchall():
-                        schema_ddl['indexes'].append({
-                            'index_name': row[0],
+                    tables[table_name]['columns'].append(sql.SQL(' ').join(col_def))
+                
+                # Generate CREATE TABLE statements
+                for table_name, table_info in tables.items():
+                    table_info['ddl'] = sql.SQL("CREATE TABLE IF NOT EXISTS {}.{} (\n  {}\n)").format(
+                        sql.Identifier(schema_name),
+                        sql.Identifier(table_name),
+                        sql.SQL(",\n  ").join(table_info['columns'])
+                    )
+                    schema_ddl['tables'].append(table_info)
+                
+                # Get indexes (excluding primary key and unique constraints)
+                rows = self._iter_rows(conn, """
+                    SELECT 
+                        i.indexname as index_name,
+                        i.tablename as table_name,
+                        i.indexdef as index_definition
+                    FROM pg_indexes i
+                    WHERE i.schemaname = %s
+                    AND i.indexdef NOT LIKE '%%UNIQUE%%'
+                    AND i.indexname NOT LIKE '%%_pkey'
+                """, (schema_name,))
+                
+                for row in rows:
+                    schema_ddl['indexes'].append({
+                        'index_name': row[0],
+                        'table_name': row[1],
+                        'ddl': row[2],
+                        'phase': 'post_data'
+                    })
+                
+                # Get constraints
+                rows = self._iter_rows(conn, """
+                    SELECT 
+                        tc.constraint_name,
+                        tc.table_name,
+                        tc.constraint_type,
+                        kcu.column_name,
+                        ccu.table_name AS foreign_table_name,
+                        ccu.column_name AS foreign_column_name
+                    FROM information_schema.table_constraints tc
+                    LEFT JOIN information_schema.key_column_usage kcu
+                      ON tc.constraint_name = kcu.constraint_name
+                      AND tc.table_schema = kcu.table_schema
+                    LEFT JOIN information_schema.constraint_column_usage ccu
+                      ON ccu.constraint_name = tc.constraint_name
+                      AND ccu.table_schema = tc.table_schema
+                    WHERE tc.table_schema = %s
+                    AND tc.constraint_type IN ('PRIMARY KEY', 'FOREIGN KEY', 'UNIQUE')
+                    ORDER BY tc.table_name, tc.constraint_name
+                """, (schema_name,))
+                
+                constraints = {}
+                for row in rows:
+                    constraint_name = row[0]
+                    if constraint_name not in constraints:
+                        constraints[constraint_name] = {
+                            'constraint_name': constraint_name,
                             'table_name': row[1],
-                            'ddl': row[2].replace(f'{schema_name}.', f'{schema_name}.')
-                        })
-                    
-                    # Get constraints
-                    cursor.execute("""
-                        SELECT 
-                            tc.constraint_name,
-                            tc.table_name,
-                            tc.constraint_type,
-                            kcu.column_name,
-                            ccu.table_name AS foreign_table_name,
-                            ccu.column_name AS foreign_column_name
-                        FROM information_schema.table_constraints tc
-                        LEFT JOIN information_schema.key_column_usage kcu
-                          ON tc.constraint_name = kcu.constraint_name
-                          AND tc.table_schema = kcu.table_schema
-                        LEFT JOIN information_schema.constraint_column_usage ccu
-                          ON ccu.constraint_name = tc.constraint_name
-                          AND ccu.table_schema = tc.table_schema
-                        WHERE tc.table_schema = %s
-                        AND tc.constraint_type IN ('PRIMARY KEY', 'FOREIGN KEY', 'UNIQUE')
-                        ORDER BY tc.table_name, tc.constraint_name
-                    """, (schema_name,))
+                            'constraint_type': row[2],
+                            'columns': [],
+                            'foreign_table': row[4],
+                            'foreign_columns': []
+                        }
                     
-                    constraints = {}
-                    for row in cursor.fetchall():
-                        constraint_name = row[0]
-                        if constraint_name not in constraints:
-                            constraints[constraint_name] = {
-                                'constraint_name': constraint_name,
-                                'table_name': row[1],
-                                'constraint_type': row[2],
-                                'columns': [],
-                                'foreign_table': row[4],
-                                'foreign_columns': []
-                            }
-                        
-                        if row[3]:
-                            constraints[constraint_name]['columns'].append(row[3])
-                        if row[5]:
-                            constraints[constraint_name]['foreign_columns'].append(row[5])
+                    if row[3]:
+                        constraints[constraint_name]['columns'].append(row[3])
+                    if row[5]:
+                        constraints[constraint_name]['foreign_columns'].append(row[5])
+                
+                # Generate constraint DDL
+                for constraint_name, constraint_info in constraints.items():
+                    table_ref = sql.SQL("{}.{}").format(
+                        sql.Identifier(schema_name),
+                        sql.Identifier(constraint_info['table_name'])
+                    )
+                    add_constraint = sql.SQL("ALTER TABLE {} ADD CONSTRAINT {}").format(
+                        table_ref, sql.Identifier(constraint_name)
+                    )
+                    column_list = sql.SQL(', ').join(map(sql.Identifier, constraint_info['columns']))
                     
-                    # Generate constraint DDL
-                    for constraint_name, constraint_info in constraints.items():
-                        if constraint_info['constraint_type'] == 'PRIMARY KEY':
-                            ddl = f"ALTER TABLE {schema_name}.{constraint_info['table_name']} ADD CONSTRAINT {constraint_name} PRIMARY KEY ({', '.join(constraint_info['columns'])})"
-                        elif constraint_info['constraint_type'] == 'UNIQUE':
-                            ddl = f"ALTER TABLE {schema_name}.{constraint_info['table_name']} ADD CONSTRAINT {constraint_name} UNIQUE ({', '.join(constraint_info['columns'])})"
-                        elif constraint_info['constraint_type'] == 'FOREIGN KEY':
-                            ddl = f"ALTER TABLE {schema_name}.{constraint_info['table_name']} ADD CONSTRAINT {constraint_name} FOREIGN KEY ({', '.join(constraint_info['columns'])}) REFERENCES {schema_name}.{constraint_info['foreign_table']} ({', '.join(constraint_info['foreign_columns'])})"
-                        else:
-                            continue
-                        
-                        constraint_info['ddl'] = ddl
-                        schema_ddl['constraints'].append(constraint_info)
+                    if constraint_info['constraint_type'] == 'PRIMARY KEY':
+                        ddl = sql.SQL("{} PRIMARY KEY ({})").format(add_constraint, column_list)
+                    elif constraint_info['constraint_type'] == 'UNIQUE':
+                        ddl = sql.SQL("{} UNIQUE ({})").format(add_constraint, column_list)
+                    elif constraint_info['constraint_type'] == 'FOREIGN KEY':
+                        # Added without a full-table check, validated in a later step
+                        ddl = sql.SQL("{} FOREIGN KEY ({}) REFERENCES {}.{} ({}) NOT VALID").format(
+                            add_constraint,
+                            column_list,
+                            sql.Identifier(schema_name),
+                            sql.Identifier(constraint_info['foreign_table']),
+                            sql.SQL(', ').join(map(sql.Identifier, constraint_info['foreign_columns']))
+                        )
+                        constraint_info['validate_ddl'] = sql.SQL("ALTER TABLE {} VALIDATE CONSTRAINT {}").format(
+                            table_ref, sql.Identifier(constraint_name)
+                        )
+                    else:
+                        continue
                     
-                    return schema_ddl
-            finally:
-                self.source_pool.putconn(conn)
-        
-        if self.connection_manager:
+                    constraint_info['ddl'] = ddl
+                    constraint_info['phase'] = 'pre_data' if constraint_info['constraint_type'] == 'PRIMARY KEY' else 'post_data'
+                    schema_ddl['constraints'].append(constraint_info)
+                
+                return schema_ddl
+    
+        if self.connection_manager and source_conn is None:
             return self.connection_manager.execute_with_retry(_extract_ddl_operation, "source")
         else:
             return _extract_ddl_operation()
@@ -504,11 +978,10 @@ class PostgreSQLMigrationService:
         else:
             _execute_ddl_operation()
             
-    def _get_table_columns(self, schema_name, table_name):
+    def _get_table_columns(self, schema_name, table_name, source_conn=None):
         """Get column names for a table."""
         def _get_columns_operation():
-            conn = self.source_pool.getconn()
-            try:
+            with self._borrow("source", source_conn) as conn:
                 with conn.cursor() as cursor:
                     cursor.execute("""
                         SELECT column_name 
@@ -517,48 +990,625 @@ class PostgreSQLMigrationService:
                         ORDER BY ordinal_position
                     """, (schema_name, table_name))
                     return [row[0] for row in cursor.fetchall()]
-            finally:
-                self.source_pool.putconn(conn)
         
-        if self.connection_manager:
+        if self.connection_manager and source_conn is None:
             return self.connection_manager.execute_with_retry(_get_columns_operation, "source")
         else:
             return _get_columns_operation()
             
-    def _migrate_data_batch(self, schema_name, table_name, columns, offset):
-        """Migrate a batch of data."""
-        def _migrate_batch_operation():
-            # Get data from source
-            source_conn = self.source_pool.getconn()
-            dest_conn = self.dest_pool.getconn()
+    def _prefetch_schema_metadata(self, schema_name, source_conn=None):
+        """Fetch column lists and estimated row counts for every table in a schema.
+        
+        Args:
+            schema_name: Name of the schema
+            source_conn: Source connection to reuse instead of borrowing one
+            
+        Returns:
+            dict: {table_name: {'columns': [column names], 'count': estimated rows}}
+        """
+        def _prefetch_operation():
+            with self._borrow("source", source_conn) as conn:
+                with conn.cursor() as cursor:
+                    metadata = {}
+                    cursor.execute("""
+                        SELECT table_name, column_name
+                        FROM information_schema.columns
+                        WHERE table_schema = %s
+                        ORDER BY table_name, ordinal_position
+                    """, (schema_name,))
+                    for table_name, column_name in cursor.fetchall():
+                        metadata.setdefault(table_name, {'columns': [], 'count': 0})['columns'].append(column_name)
+                        
+                    # reltuples is -1 for tables that were never analyzed
+                    cursor.execute("""
+                        SELECT c.relname, GREATEST(c.reltuples, 0)::bigint
+                        FROM pg_class c
+                        JOIN pg_namespace n ON n.oid = c.relnamespace
+                        WHERE n.nspname = %s AND c.relkind IN ('r', 'p')
+                    """, (schema_name,))
+                    for table_name, estimated_rows in cursor.fetchall():
+                        if table_name in metadata:
+                            metadata[table_name]['count'] = estimated_rows
+                    return metadata
+        
+        if self.connection_manager and source_conn is None:
+            return self.connection_manager.execute_with_retry(_prefetch_operation, "source")
+        else:
+            return _prefetch_operation()
             
+    def _execute_ddl_bulk(self, ddl_list):
+        """Execute a list of DDL statements on the destination in one transaction.
+        
+        Each statement runs under its own savepoint, so a failing object is rolled
+        back and reported without aborting the others.
+        
+        Args:
+            ddl_list: List of DDL info dicts, each with a 'ddl' key
+            
+        Returns:
+            list: (ddl_info, error) pairs in input order; error is None on success
+        """
+        def _execute_ddl_bulk_operation():
+            conn = self.dest_pool.getconn()
             try:
-                with source_conn.cursor() as source_cursor:
-                    # Fetch batch data
-                    source_cursor.execute(
-                        sql.SQL("SELECT {} FROM {}.{} ORDER BY {} LIMIT %s OFFSET %s").format(
-                            sql.SQL(', ').join(map(sql.Identifier, columns)),
+                results = []
+                with conn.cursor() as cursor:
+                    for ddl_info in ddl_list:
+                        cursor.execute("SAVEPOINT ddl_item")
+                        try:
+                            cursor.execute(ddl_info['ddl'])
+                        except OperationalError:
+                            raise
+                        except DatabaseError as e:
+                            cursor.execute("ROLLBACK TO SAVEPOINT ddl_item")
+                            results.append((ddl_info, e))
+                        else:
+                            cursor.execute("RELEASE SAVEPOINT ddl_item")
+                            results.append((ddl_info, None))
+                conn.commit()
+                return results
+            finally:
+                self.dest_pool.putconn(conn)
+        
+        if not ddl_list:
+            return []
+        if self.connection_manager:
+            return self.connection_manager.execute_with_retry(_execute_ddl_bulk_operation, "destination")
+        else:
+            return _execute_ddl_bulk_operation()
+            
+    def _build_indexes(self, index_list):
+        """Create indexes on the destination, each in its own transaction.
+        
+        Every build may use up to min(8, CPU count - 1) parallel maintenance
+        workers and 2GB of maintenance_work_mem; the settings are SET LOCAL so
+        they don't leak into pooled connections.
+        
+        Args:
+            index_list: List of index DDL info dicts, each with 'index_name' and 'ddl'
+            
+        Returns:
+            list: (ddl_info, error) pairs in input order; error is None on success
+        """
+        parallel_workers = max(0, min(8, (os.cpu_count() or 1) - 1))
+        
+        def _build_index_operation(index_ddl):
+            with self._borrow("destination") as conn:
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.execute(
+                            f"SET LOCAL max_parallel_maintenance_workers = {parallel_workers}; "
+                            "SET LOCAL maintenance_work_mem = '2GB'"
+                        )
+                        cursor.execute(index_ddl['ddl'])
+                    conn.commit()
+                    return None
+                except OperationalError:
+                    raise
+                except DatabaseError as e:
+                    # Reported, not raised, so a bad definition isn't retried
+                    conn.rollback()
+                    return e
+                    
+        results = []
+        for index_ddl in index_list:
+            start_time = time.time()
+            if self.connection_manager:
+                error = self.connection_manager.execute_with_retry(_build_index_operation, "destination", index_ddl)
+            else:
+                error = _build_index_operation(index_ddl)
+            if error is None:
+                logger.info(f"Built index {index_ddl['index_name']} in {time.time() - start_time:.2f}s")
+            results.append((index_ddl, error))
+        return results
+        
+    def _get_primary_key_columns(self, schema_name, table_name, source_conn=None):
+        """Get the primary key column names for a table, in key order."""
+        def _get_primary_key_operation():
+            with self._borrow("source", source_conn) as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT a.attname
+                        FROM pg_index i
+                        JOIN pg_class c ON c.oid = i.indrelid
+                        JOIN pg_namespace n ON n.oid = c.relnamespace
+                        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+                        WHERE i.indisprimary AND n.nspname = %s AND c.relname = %s
+                        ORDER BY array_position(i.indkey::int2[], a.attnum)
+                    """, (schema_name, table_name))
+                    return [row[0] for row in cursor.fetchall()]
+        
+        if self.connection_manager and source_conn is None:
+            return self.connection_manager.execute_with_retry(_get_primary_key_operation, "source")
+        else:
+            return _get_primary_key_operation()
+            
+    def _sample_key_boundaries(self, schema_name, table_name, key_column, num_ranges, source_conn=None):
+        """Sample a key column into split points for num_ranges roughly equal ranges.
+        
+        Args:
+            schema_name: Name of the schema
+            table_name: Name of the table
+            key_column: Column to split on
+            num_ranges: Number of ranges to produce
+            source_conn: Source connection to reuse instead of borrowing one
+            
+        Returns:
+            list: Ascending, distinct split points, or None if the key can't be split
+        """
+        def _sample_operation():
+            with self._borrow("source", source_conn) as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        sql.SQL("SELECT percentile_disc(%s::float8[]) WITHIN GROUP (ORDER BY {}) FROM {}.{}").format(
+                            sql.Identifier(key_column),
                             sql.Identifier(schema_name),
-                            sql.Identifier(table_name),
-                            sql.Identifier(columns[0])  # Order by first column for consistency
+                            sql.Identifier(table_name)
                         ),
-                        (self.batch_size, offset)
+                        ([i / num_ranges for i in range(1, num_ranges)],)
+                    )
+                    return cursor.fetchone()[0]
+        
+        if self.connection_manager and source_conn is None:
+            points = self.connection_manager.execute_with_retry(_sample_operation, "source")
+        else:
+            points = _sample_operation()
+            
+        # Arrays of types psycopg2 doesn't parse come back as a string
+        if not isinstance(points, list):
+            return None
+        boundaries = list(dict.fromkeys(point for point in points if point is not None))
+        return boundaries or None
+        
+    def _table_batch_size(self, schema_name, table_name, source_conn=None):
+        """Pick a batch size that keeps each batch near _TARGET_BATCH_BYTES.
+        
+        The average row width is measured on a small sample, so narrow tables get
+        larger batches and wide ones smaller batches. Falls back to self.batch_size
+        when auto-sizing is off or the sample can't be taken.
+        
+        Returns:
+            int: Rows per batch
+        """
+        if not self.auto_batch_size:
+            return self.batch_size
+            
+        def _row_width_operation():
+            with self._borrow("source", source_conn) as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        sql.SQL("SELECT avg(pg_column_size(s.*)) FROM (SELECT * FROM {}.{} LIMIT 1000) s").format(
+                            sql.Identifier(schema_name),
+                            sql.Identifier(table_name)
+                        )
                     )
-                    batch_data = source_cursor.fetchall()
+                    return cursor.fetchone()[0]
+        
+        try:
+            if self.connection_manager and source_conn is None:
+                avg_row_bytes = self.connection_manager.execute_with_retry(_row_width_operation, "source")
+            else:
+                avg_row_bytes = _row_width_operation()
+        except Exception as e:
+            logger.debug(f"Could not sample row width of {schema_name}.{table_name}: {e}")
+            if source_conn is not None:
+                source_conn.rollback()
+            return self.batch_size
+            
+        if not avg_row_bytes:
+            return self.batch_size
+        batch_size = max(_MIN_AUTO_BATCH_ROWS, min(_MAX_AUTO_BATCH_ROWS, int(_TARGET_BATCH_BYTES // avg_row_bytes)))
+        logger.debug(f"Batch size for {schema_name}.{table_name}: {batch_size} rows "
+                    f"(~{float(avg_row_bytes):.0f} bytes per row)")
+        return batch_size
+        
+    def _iter_source_batches(self, schema_name, table_name, columns, where=None, params=None,
+                             order_by=None, source_conn=None, batch_size=None):
+        """Stream a source table in batches through a server-side (named) cursor.
+        
+        The table is read in a single pass, so each batch costs O(batch_size) on the
+        server instead of re-scanning every row before an OFFSET. The read runs in
+        one REPEATABLE READ, READ ONLY transaction, which gives a consistent
+        snapshot without sorting; PostgreSQL is free to pick a plain sequential scan.
+        
+        Args:
+            schema_name: Name of the schema
+            table_name: Name of the table
+            columns: Column names to select, in order
+            where: Optional sql.Composable predicate restricting the rows read
+            params: Query parameters for the predicate
+            order_by: Optional column to sort by, e.g. the key of a ranged read
+            source_conn: Source connection to reuse instead of borrowing one
+            batch_size: Rows per batch (default: self.batch_size)
+            
+        Yields:
+            list: Row tuples, at most batch_size per batch
+        """
+        batch_size = batch_size or self.batch_size
+        with self._borrow("source", source_conn) as conn:
+            # Isolation can only be set at the start of a transaction
+            conn.rollback()
+            with conn.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+            with conn.cursor(name=f"mig_{uuid.uuid4().hex}") as source_cursor:
+                source_cursor.itersize = batch_size
+                query = sql.SQL("SELECT {} FROM {}.{}").format(
+                    sql.SQL(', ').join(map(sql.Identifier, columns)),
+                    sql.Identifier(schema_name),
+                    sql.Identifier(table_name)
+                )
+                if where is not None:
+                    query = sql.SQL("{} WHERE {}").format(query, where)
+                if order_by is not None:
+                    query = sql.SQL("{} ORDER BY {}").format(query, sql.Identifier(order_by))
+                source_cursor.execute(query, params)
+                while True:
+                    batch_data = source_cursor.fetchmany(batch_size)
+                    if not batch_data:
+                        break
+                    yield batch_data
+            conn.rollback()
+            
+    def _copy_table_direct(self, schema_name, table_name, columns, source_conn=None):
+        """Pipe COPY ... TO STDOUT on the source straight into COPY ... FROM STDIN on the destination.
+        
+        The raw COPY stream flows through an OS pipe between two threads, so no
+        Python row objects are created. Binary format is used when every column
+        has the same built-in type on both sides, text format otherwise. The load
+        is one destination transaction: it is rolled back if either side fails.
+        
+        Args:
+            schema_name: Name of the schema
+            table_name: Name of the table
+            columns: Column names to copy, in order
+            source_conn: Source connection to reuse instead of borrowing one
+            
+        Returns:
+            int: Number of rows copied
+        """
+        def _direct_copy_operation():
+            with self._borrow("source", source_conn) as src_conn, self._borrow("destination") as dest_conn:
+                src_conn.rollback()
+                copy_format = "BINARY" if self._binary_copy_compatible(
+                    src_conn, dest_conn, schema_name, table_name, columns) else "TEXT"
+                copy_target = sql.SQL("{}.{} ({})").format(
+                    sql.Identifier(schema_name),
+                    sql.Identifier(table_name),
+                    sql.SQL(', ').join(map(sql.Identifier, columns))
+                )
+                copy_out_sql = sql.SQL("COPY {} TO STDOUT WITH (FORMAT {})").format(
+                    copy_target, sql.SQL(copy_format)).as_string(src_conn)
+                copy_in_sql = sql.SQL("COPY {} FROM STDIN WITH (FORMAT {})").format(
+                    copy_target, sql.SQL(copy_format)).as_string(dest_conn)
+                    
+                read_fd, write_fd = os.pipe()
+                reader = os.fdopen(read_fd, 'rb')
+                writer = os.fdopen(write_fd, 'wb')
+                errors = []
                 
-                if not batch_data:
-                    return {"inserted": 0, "failed": 0, "processed": 0}
+                def _copy_out():
+                    try:
+                        with writer, src_conn.cursor() as source_cursor:
+                            source_cursor.copy_expert(copy_out_sql, writer)
+                    except Exception as e:
+                        errors.append(e)
+                        
+                copy_out_thread = threading.Thread(target=_copy_out, name=f"pg-copy-out-{table_name}", daemon=True)
+                copy_out_thread.start()
+                try:
+                    # Closing the reader on failure unblocks the writer with a broken pipe
+                    with reader, dest_conn.cursor() as dest_cursor:
+                        if self.bulk_mode:
+                            self._configure_bulk_session(dest_cursor)
+                        dest_cursor.copy_expert(copy_in_sql, reader)
+                        rows = dest_cursor.rowcount
+                finally:
+                    copy_out_thread.join()
+                    src_conn.rollback()
+                    
+                # A source failure ends the stream early, which text COPY would accept
+                if errors:
+                    dest_conn.rollback()
+                    raise errors[0]
+                dest_conn.commit()
+                return rows
+        
+        if self.connection_manager and source_conn is None:
+            return self.connection_manager.execute_with_retry(_direct_copy_operation, "both")
+        else:
+            return _direct_copy_operation()
+            
+    def _binary_copy_compatible(self, source_conn, dest_conn, schema_name, table_name, columns):
+        """Check whether a table can be copied in binary COPY format.
+        
+        Binary COPY carries type OIDs for array elements and records, so it is
+        only used when every column has the same built-in type on both sides.
+        """
+        qualified_name = sql.SQL("{}.{}").format(sql.Identifier(schema_name), sql.Identifier(table_name))
+        
+        def _column_types(conn):
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT a.attname, format_type(a.atttypid, a.atttypmod), a.atttypid < 16384
+                    FROM pg_attribute a
+                    WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+                """, (qualified_name.as_string(conn),))
+                return {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
                 
-                # Insert into destination
-                with dest_conn.cursor() as dest_cursor:
-                    insert_sql = sql.SQL("INSERT INTO {}.{} ({}) VALUES ({})").format(
-                        sql.Identifier(schema_name),
-                        sql.Identifier(table_name),
-                        sql.SQL(', ').join(map(sql.Identifier, columns)),
-                        sql.SQL(', ').join(sql.Placeholder() * len(columns))
+        source_types = _column_types(source_conn)
+        dest_types = _column_types(dest_conn)
+        return all(
+            column in source_types
+            and source_types[column][1]
+            and source_types[column] == dest_types.get(column)
+            for column in columns
+        )
+        
+    def _copy_table_batched(self, schema_name, table_name, columns, stats, progress_bar,
+                            source_conn=None, batch_size=None):
+        """Copy a table batch by batch, reading ahead while the previous batch is written.
+        
+        Each batch is its own destination transaction, so a bad batch is counted
+        in stats["failed_records"] without losing the rest of the table.
+        """
+        # Read the next batches on a producer thread while this thread writes, so
+        # source and destination work at the same time; two queued batches bound memory
+        batch_queue = queue.Queue(maxsize=2)
+        stop_event = threading.Event()
+        producer = threading.Thread(
+            target=self._produce_batches,
+            args=(schema_name, table_name, columns, batch_queue, stop_event, source_conn, batch_size),
+            name=f"pg-read-{table_name}",
+            daemon=True
+        )
+        producer.start()
+        try:
+            self._consume_batches(schema_name, table_name, columns, batch_queue, stats, progress_bar)
+        finally:
+            stop_event.set()
+            producer.join()
+            
+    def _produce_batches(self, schema_name, table_name, columns, batch_queue, stop_event,
+                         source_conn=None, batch_size=None):
+        """Stream source batches into a bounded queue, ending with a None sentinel.
+        
+        A read error is queued in place of a batch so the consumer can raise it.
+        Stops early once stop_event is set.
+        """
+        def _put(item):
+            while not stop_event.is_set():
+                try:
+                    batch_queue.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+            
+        batches = self._iter_source_batches(schema_name, table_name, columns,
+                                            source_conn=source_conn, batch_size=batch_size)
+        try:
+            for batch_data in batches:
+                if not _put(batch_data):
+                    return
+        except Exception as e:
+            _put(e)
+        finally:
+            batches.close()
+            _put(None)
+            
+    def _consume_batches(self, schema_name, table_name, columns, batch_queue, stats, progress_bar):
+        """Write queued batches to the destination until the None sentinel arrives.
+        
+        Raises:
+            Exception: Any error the producer hit while reading the source
+        """
+        while True:
+            batch_data = batch_queue.get()
+            if batch_data is None:
+                return
+            if isinstance(batch_data, Exception):
+                raise batch_data
+            batch_stats = self._copy_batch_to_destination(schema_name, table_name, columns, batch_data)
+            stats["migrated_records"] += batch_stats["inserted"]
+            stats["failed_records"] += batch_stats["failed"]
+            progress_bar.update(batch_stats["processed"])
+            
+    def _configure_bulk_session(self, dest_cursor):
+        """Relax durability and raise memory limits for the current destination transaction.
+        
+        With synchronous_commit off, a destination crash can lose the last few
+        committed batches, so this is only enabled for restartable bulk loads.
+        The settings go out as one simple-query message, costing a single round
+        trip per batch rather than one per setting.
+        """
+        dest_cursor.execute(
+            "SET LOCAL synchronous_commit = off; "
+            "SET LOCAL maintenance_work_mem = '1GB'; "
+            "SET LOCAL work_mem = '256MB'"
+        )
+        
+    def _set_table_logged(self, schema_name, table_name, logged):
+        """Switch a destination table between LOGGED and UNLOGGED.
+        
+        Args:
+            schema_name: Name of the schema
+            table_name: Name of the table
+            logged: True for SET LOGGED, False for SET UNLOGGED
+            
+        Returns:
+            bool: True if the table was switched
+        """
+        def _set_logged_operation():
+            with self._borrow("destination") as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        sql.SQL("ALTER TABLE {}.{} SET {}").format(
+                            sql.Identifier(schema_name),
+                            sql.Identifier(table_name),
+                            sql.SQL("LOGGED" if logged else "UNLOGGED")
+                        )
                     )
-                    
-                    execute_batch(dest_cursor, insert_sql, batch_data, page_size=100)
+                conn.commit()
+        
+        try:
+            if self.connection_manager:
+                self.connection_manager.execute_with_retry(_set_logged_operation, "destination")
+            else:
+                _set_logged_operation()
+            return True
+        except Exception as e:
+            # e.g. tables referenced by a foreign key can't be made UNLOGGED
+            logger.warning(f"Could not set {schema_name}.{table_name} "
+                          f"{'LOGGED' if logged else 'UNLOGGED'}: {e}")
+            return False
+            
+    def _insert_batch(self, dest_cursor, schema_name, table_name, columns, batch_data):
+        """Insert a batch with a multi-row INSERT prepared once for the whole batch.
+        
+        Full pages of rows go through EXECUTE of a statement PREPAREd in the batch
+        transaction, so the INSERT is parsed and planned once per batch instead of
+        once per page; the remainder uses execute_values. The statement is
+        deallocated before returning, including on error, because PREPARE is not
+        undone by a rollback and the connection goes back to the pool.
+        """
+        num_columns = len(columns)
+        # Stay under PostgreSQL's limit of 65535 bind parameters per statement
+        page_size = max(1, min(1000, 65535 // num_columns, len(batch_data)))
+        full_pages = len(batch_data) // page_size
+        statements = self._table_statements(schema_name, table_name, columns)
+        
+        remainder = batch_data
+        if full_pages > 1:  # Preparing only pays off when the statement is reused
+            page_key = ('page', page_size)
+            if page_key not in statements:
+                statements[page_key] = (
+                    sql.SQL(", ".join(
+                        "(" + ", ".join(f"${row * num_columns + col + 1}" for col in range(num_columns)) + ")"
+                        for row in range(page_size)
+                    )),
+                    sql.SQL(', ').join(sql.Placeholder() * (page_size * num_columns))
+                )
+            value_rows, placeholders = statements[page_key]
+            statement_name = sql.Identifier(f"mig_ins_{uuid.uuid4().hex}")
+            execute_sql = sql.SQL("EXECUTE {} ({})").format(statement_name, placeholders)
+            dest_cursor.execute(sql.SQL("PREPARE {} AS {} VALUES {}").format(
+                statement_name, statements['insert'], value_rows))
+            try:
+                for start in range(0, full_pages * page_size, page_size):
+                    dest_cursor.execute(execute_sql, [value for row in batch_data[start:start + page_size] for value in row])
+            except Exception:
+                dest_cursor.connection.rollback()
+                raise
+            finally:
+                try:
+                    dest_cursor.execute(sql.SQL("DEALLOCATE {}").format(statement_name))
+                except Exception as e:
+                    logger.debug(f"Could not deallocate prepared insert for {schema_name}.{table_name}: {e}")
+            remainder = batch_data[full_pages * page_size:]
+            
+        if remainder:
+            execute_values(dest_cursor, statements['insert_values'], remainder, page_size=page_size)
+            
+    def _table_statements(self, schema_name, table_name, columns):
+        """Get the destination write statements for a table, composed once and reused per batch.
+        
+        Returns:
+            dict: 'copy_in' and 'insert' / 'insert_values' sql.Composed statements;
+                callers may cache derived forms (rendered strings, page templates) in it
+        """
+        key = (schema_name, table_name, tuple(columns))
+        statements = self._prepared_stmts.get(key)
+        if statements is None:
+            target = sql.SQL("{}.{} ({})").format(
+                sql.Identifier(schema_name),
+                sql.Identifier(table_name),
+                sql.SQL(', ').join(map(sql.Identifier, columns))
+            )
+            statements = {
+                'copy_in': sql.SQL("COPY {} FROM STDIN").format(target),
+                'insert': sql.SQL("INSERT INTO {}").format(target),
+                'insert_values': sql.SQL("INSERT INTO {} VALUES %s").format(target)
+            }
+            self._prepared_stmts[key] = statements
+        return statements
+            
+    def _json_column_flags(self, cursor, schema_name, table_name, columns):
+        """Flag which of the given columns are json/jsonb on the destination table.
+        
+        psycopg2 decodes json values to Python objects, lists included, so COPY needs
+        to know which list values are JSON documents rather than arrays.
+        
+        Returns:
+            tuple: One boolean per column, or None if the table has no json/jsonb columns
+        """
+        cursor.execute("""
+            SELECT a.attname
+            FROM pg_attribute a
+            JOIN pg_class c ON c.oid = a.attrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %s AND c.relname = %s
+              AND a.attnum > 0 AND NOT a.attisdropped
+              AND a.atttypid IN ('json'::regtype, 'jsonb'::regtype)
+        """, (schema_name, table_name))
+        json_names = {row[0] for row in cursor.fetchall()}
+        if not json_names:
+            return None
+        return tuple(column in json_names for column in columns)
+        
+    def _copy_batch_to_destination(self, schema_name, table_name, columns, batch_data):
+        """Write a batch of rows to the destination table with a single COPY.
+        
+        Targets that refuse COPY fall back to multi-row INSERTs via execute_values
+        for the rest of the migration.
+        """
+        table_key = (schema_name, table_name)
+        
+        def _copy_batch_operation():
+            dest_conn = self.dest_pool.getconn()
+            try:
+                with dest_conn.cursor() as dest_cursor:
+                    if self.bulk_mode:
+                        self._configure_bulk_session(dest_cursor)
+                    if self._use_copy.get(table_key, True):
+                        statements = self._table_statements(schema_name, table_name, columns)
+                        if 'copy_in_sql' not in statements:
+                            statements['json_columns'] = self._json_column_flags(dest_cursor, schema_name, table_name, columns)
+                            statements['copy_in_sql'] = statements['copy_in'].as_string(dest_conn)
+                        try:
+                            dest_cursor.copy_expert(
+                                statements['copy_in_sql'],
+                                _rows_to_copy_buffer(batch_data, statements['json_columns'])
+                            )
+                        except (FeatureNotSupported, WrongObjectType) as e:
+                            # e.g. a view with INSTEAD OF triggers accepts INSERT but not COPY
+                            logger.info(f"COPY not supported for {schema_name}.{table_name}, using INSERT: {e}")
+                            self._use_copy[table_key] = False
+                            dest_conn.rollback()
+                            if self.bulk_mode:
+                                self._configure_bulk_session(dest_cursor)
+                                
+                    if not self._use_copy.get(table_key, True):
+                        self._insert_batch(dest_cursor, schema_name, table_name, columns, batch_data)
                     dest_conn.commit()
                 
                 return {
@@ -575,14 +1625,13 @@ class PostgreSQLMigrationService:
                     pass
                 return {
                     "inserted": 0,
-                    "failed": len(batch_data) if 'batch_data' in locals() else self.batch_size,
-                    "processed": len(batch_data) if 'batch_data' in locals() else self.batch_size
+                    "failed": len(batch_data),
+                    "processed": len(batch_data)
                 }
             finally:
-                self.source_pool.putconn(source_conn)
                 self.dest_pool.putconn(dest_conn)
         
         if self.connection_manager:
-            return self.connection_manager.execute_with_retry(_migrate_batch_operation, "both")
+            return self.connection_manager.execute_with_retry(_copy_batch_operation, "destination")
         else:
-            return _migrate_batch_operation()
+            return _copy_batch_operation()
@@ -4,160 +4,177 @@ Comprehensive demonstration of the new PostgreSQL Connection UI functionality.
 This script shows how the updated UI works with individual connection fields.
 """
 
+import io
 import sys
 import os
+import traceback
+from collections import namedtuple
+from contextlib import redirect_stdout
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+_BANNER = "=" * 50
+
+# Password masks by length, built once
+_MASKS = ["*" * length for length in range(129)]
+
+PGCase = namedtuple("PGCase", "name server database username password description")
+
+# Connection string test cases for different scenarios
+_TEST_CASES = (
+    PGCase("Azure PostgreSQL", "myserver.postgres.database.azure.com", "production_db",
+           "admin@myserver", "SecurePass123!", "Azure Database for PostgreSQL with SSL"),
+    PGCase("Local PostgreSQL", "localhost:5432", "development_db",
+           "developer", "dev_password", "Local development database"),
+    PGCase("Remote PostgreSQL", "db.company.com", "analytics",
+           "analyst", "analytics_pass", "Remote company database"),
+)
+
+# (test name, server, database, username, password) combinations that must fail validation
+_VALIDATION_TESTS = (
+    ("Empty server", "", "testdb", "user", "pass"),
+    ("Invalid database name", "localhost", "test@db!", "user", "pass"),
+    ("Missing username", "localhost", "testdb", "", "pass"),
+    ("Missing password", "localhost", "testdb", "user", ""),
+)
+
+def _mask(password):
+    """Return a string of asterisks as long as the password."""
+    length = len(password)
+    return _MASKS[length] if length < len(_MASKS) else "*" * length
+
 def demonstrate_postgresql_ui():
-    """Demonstrate the new PostgreSQL connection UI functionality."""
+    """Demonstrate the new PostgreSQL connection UI functionality.
+    
+    Output is collected in memory and written to stdout in one go, also when the demo fails part way.
+    """
+    buffer = io.StringIO()
+    try:
+        with redirect_stdout(buffer):
+            return _run_demonstration()
+    finally:
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
+
+def _run_demonstration():
+    """Run the demonstration steps, printing to the current stdout."""
     print("🚀 PostgreSQL Connection UI Demonstration")
-    print("=" * 50)
+    print(_BANNER)
     
     try:
+        # The connection helpers are static, so no GUI instance is needed until the GUI variables test
         from gui import CosmosDBMigrationGUI
-        
-        # Create GUI instance
-        app = CosmosDBMigrationGUI()
-        print("✅ GUI application created successfully")
-        
-        print("\n📝 NEW FEATURES:")
-        print("- Individual input fields for server, database, username, password")
-        print("- Automatic connection string building")
-        print("- Field validation with helpful error messages")
-        print("- Support for Azure PostgreSQL with SSL")
-        
-        print("\n🔧 Testing Connection String Building:")
-        
-        # Test cases for different scenarios
-        test_cases = [
-            {
-                "name": "Azure PostgreSQL",
-                "server": "myserver.postgres.database.azure.com",
-                "database": "production_db",
-                "username": "admin@myserver",
-                "password": "SecurePass123!",
-                "description": "Azure Database for PostgreSQL with SSL"
-            },
-            {
-                "name": "Local PostgreSQL",
-                "server": "localhost:5432",
-                "database": "development_db",
-                "username": "developer",
-                "password": "dev_password",
-                "description": "Local development database"
-            },
-            {
-                "name": "Remote PostgreSQL",
-                "server": "db.company.com",
-                "database": "analytics",
-                "username": "analyst",
-                "password": "analytics_pass",
-                "description": "Remote company database"
-            }
-        ]
-        
-        for i, test in enumerate(test_cases, 1):
-            print(f"\n{i}. {test['name']} ({test['description']}):")
-            print(f"   Server: {test['server']}")
-            print(f"   Database: {test['database']}")
-            print(f"   Username: {test['username']}")
-            print(f"   Password: {'*' * len(test['password'])}")
+    except Exception as e:
+        print(f"❌ Error during demonstration: {str(e)}")
+        traceback.print_exc()
+        return False
+    
+    print("\n📝 NEW FEATURES:")
+    print("- Individual input fields for server, database, username, password")
+    print("- Automatic connection string building")
+    print("- Field validation with helpful error messages")
+    print("- Support for Azure PostgreSQL with SSL")
+    
+    print("\n🔧 Testing Connection String Building:")
+    
+    build_conn_str = CosmosDBMigrationGUI.build_postgresql_connection_string
+    for i, test in enumerate(_TEST_CASES, 1):
+        print(f"\n{i}. {test.name} ({test.description}):")
+        print(f"   Server: {test.server}")
+        print(f"   Database: {test.database}")
+        print(f"   Username: {test.username}")
+        mask = _mask(test.password)
+        print(f"   Password: {mask}")
+        
+        try:
+            _, display_conn_str = build_conn_str(
+                test.server, test.database, test.username, test.password
+            )
+            print(f"   ✅ Connection String: {display_conn_str}")
             
-            try:
-                conn_str = app.build_postgresql_connection_string(
-                    test['server'], test['database'], test['username'], test['password']
-                )
-                # Mask the password in display
-                display_conn_str = conn_str.replace(test['password'], '*' * len(test['password']))
-                print(f"   ✅ Connection String: {display_conn_str}")
-                
-                # Validate fields
-                errors = app.validate_postgresql_connection_fields(
-                    test['server'], test['database'], test['username'], test['password']
-                )
-                if not errors:
-                    print(f"   ✅ Validation: All fields valid")
-                else:
-                    print(f"   ❌ Validation errors: {errors}")
-                    
-            except Exception as e:
-                print(f"   ❌ Error: {str(e)}")
-        
-        print("\n🧪 Testing Field Validation:")
-        
-        validation_tests = [
-            ("Empty server", "", "testdb", "user", "pass"),
-            ("Invalid database name", "localhost", "test@db!", "user", "pass"),
-            ("Missing username", "localhost", "testdb", "", "pass"),
-            ("Missing password", "localhost", "testdb", "user", ""),
-        ]
-        
-        for test_name, server, db, user, password in validation_tests:
-            errors = app.validate_postgresql_connection_fields(server, db, user, password)
-            if errors:
-                print(f"   ✅ {test_name}: {errors[0]}")
+            # Validate fields
+            errors = CosmosDBMigrationGUI.validate_postgresql_connection_fields(
+                test.server, test.database, test.username, test.password
+            )
+            if not errors:
+                print(f"   ✅ Validation: All fields valid")
             else:
-                print(f"   ❌ {test_name}: Should have validation errors")
-        
-        print("\n🎛️  Testing GUI Variables:")
-        
-        # Test source connection fields
-        app.pg_source_server_var.set("source.postgres.database.azure.com")
-        app.pg_source_db_var.set("source_database")
-        app.pg_source_user_var.set("source_user@source")
-        app.pg_source_pass_var.set("source_password123")
-        
-        # Test destination connection fields
-        app.pg_dest_server_var.set("dest.postgres.database.azure.com")
-        app.pg_dest_db_var.set("dest_database")
-        app.pg_dest_user_var.set("dest_user@dest")
-        app.pg_dest_pass_var.set("dest_password456")
-        
-        print("   ✅ Source fields set:")
-        print(f"      Server: {app.pg_source_server_var.get()}")
-        print(f"      Database: {app.pg_source_db_var.get()}")
-        print(f"      Username: {app.pg_source_user_var.get()}")
-        print(f"      Password: {'*' * len(app.pg_source_pass_var.get())}")
-        
-        print("   ✅ Destination fields set:")
-        print(f"      Server: {app.pg_dest_server_var.get()}")
-        print(f"      Database: {app.pg_dest_db_var.get()}")
-        print(f"      Username: {app.pg_dest_user_var.get()}")
-        print(f"      Password: {'*' * len(app.pg_dest_pass_var.get())}")
-        
-        print("\n✨ UI IMPROVEMENTS SUMMARY:")
-        print("1. ✅ Replaced single connection string input with structured fields")
-        print("2. ✅ Added automatic connection string building from components")
-        print("3. ✅ Implemented comprehensive field validation")
-        print("4. ✅ Added support for Azure PostgreSQL SSL configuration")
-        print("5. ✅ Fixed relative import issues for production deployment")
-        print("6. ✅ Maintained backward compatibility with existing functionality")
-        
-        print("\n🎯 HOW TO USE:")
-        print("1. Run: python gui_launcher.py")
-        print("2. Click on 'PostgreSQL Migration' tab")
-        print("3. Fill in source connection fields:")
-        print("   - Server URL: your.postgres.server.com")
-        print("   - Database: your_database_name")
-        print("   - Username: your_username")
-        print("   - Password: your_password")
-        print("4. Fill in destination connection fields")
-        print("5. Click 'Test Connections' to validate")
-        print("6. Click 'Connect' to establish connections")
-        print("7. Proceed with migration setup")
-        
-        print("\n🎉 SUCCESS! The PostgreSQL connection UI has been successfully updated!")
-        print("The relative import issue has been resolved and all functionality is working.")
-        
-        return True
-        
+                print(f"   ❌ Validation errors: {errors}")
+                
+        except Exception as e:
+            print(f"   ❌ Error: {str(e)}")
+    
+    print("\n🧪 Testing Field Validation:")
+    
+    for test_name, server, db, user, password in _VALIDATION_TESTS:
+        errors = CosmosDBMigrationGUI.validate_postgresql_connection_fields(server, db, user, password)
+        if errors:
+            print(f"   ✅ {test_name}: {errors[0]}")
+        else:
+            print(f"   ❌ {test_name}: Should have validation errors")
+    
+    print("\n🎛️  Testing GUI Variables:")
+    
+    try:
+        # Headless instances hold the connection fields as plain Python values, no Tk needed
+        app = CosmosDBMigrationGUI(headless=True)
     except Exception as e:
-        print(f"❌ Error during demonstration: {str(e)}")
-        import traceback
+        print(f"❌ Error creating the GUI application: {str(e)}")
         traceback.print_exc()
         return False
+    
+    print("   ✅ Headless GUI application created successfully")
+    
+    # Test source connection fields
+    app.pg_source_server_var.set("source.postgres.database.azure.com")
+    app.pg_source_db_var.set("source_database")
+    app.pg_source_user_var.set("source_user@source")
+    app.pg_source_pass_var.set("source_password123")
+    
+    # Test destination connection fields
+    app.pg_dest_server_var.set("dest.postgres.database.azure.com")
+    app.pg_dest_db_var.set("dest_database")
+    app.pg_dest_user_var.set("dest_user@dest")
+    app.pg_dest_pass_var.set("dest_password456")
+    
+    print("   ✅ Source fields set:")
+    print(f"      Server: {app.pg_source_server_var.get()}")
+    print(f"      Database: {app.pg_source_db_var.get()}")
+    print(f"      Username: {app.pg_source_user_var.get()}")
+    print(f"      Password: {_mask(app.pg_source_pass_var.get())}")
+    
+    print("   ✅ Destination fields set:")
+    print(f"      Server: {app.pg_dest_server_var.get()}")
+    print(f"      Database: {app.pg_dest_db_var.get()}")
+    print(f"      Username: {app.pg_dest_user_var.get()}")
+    print(f"      Password: {_mask(app.pg_dest_pass_var.get())}")
+    
+    print("\n✨ UI IMPROVEMENTS SUMMARY:")
+    print("1. ✅ Replaced single connection string input with structured fields")
+    print("2. ✅ Added automatic connection string building from components")
+    print("3. ✅ Implemented comprehensive field validation")
+    print("4. ✅ Added support for Azure PostgreSQL SSL configuration")
+    print("5. ✅ Fixed relative import issues for production deployment")
+    print("6. ✅ Maintained backward compatibility with existing functionality")
+    
+    print("\n🎯 HOW TO USE:")
+    print("1. Run: python gui_launcher.py")
+    print("2. Click on 'PostgreSQL Migration' tab")
+    print("3. Fill in source connection fields:")
+    print("   - Server URL: your.postgres.server.com")
+    print("   - Database: your_database_name")
+    print("   - Username: your_username")
+    print("   - Password: your_password")
+    print("4. Fill in destination connection fields")
+    print("5. Click 'Test Connections' to validate")
+    print("6. Click 'Connect' to establish connections")
+    print("7. Proceed with migration setup")
+    
+    print("\n🎉 SUCCESS! The PostgreSQL connection UI has been successfully updated!")
+    print("The relative import issue has been resolved and all functionality is working.")
+    
+    return True
 
 if __name__ == "__main__":
     demonstrate_postgresql_ui()
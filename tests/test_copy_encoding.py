@@ -0,0 +1,78 @@
+"""
+Regression tests for the COPY text encoding used by the PostgreSQL bulk load paths.
+"""
+
+import datetime
+import json
+import os
+import sys
+import unittest
+
+from psycopg2.extras import DateRange, NumericRange
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from postgresql_connection_manager import _copy_text_line, _copy_text_value
+from postgresql_migration_service import _rows_to_copy_buffer
+
+
+class CopyTextEncodingTests(unittest.TestCase):
+    """Values psycopg2 decodes from array and json columns must round-trip through COPY."""
+    
+    def test_int_array_is_array_literal(self):
+        self.assertEqual(_copy_text_value([1, 2, None]), '{"1","2",NULL}')
+        
+    def test_nested_array(self):
+        self.assertEqual(_copy_text_value([[1, 2], [3, 4]]), '{{"1","2"},{"3","4"}}')
+        
+    def test_text_array_with_quotes_and_commas(self):
+        # Array quoting escapes the quote, then COPY escaping doubles that backslash
+        self.assertEqual(
+            _copy_text_value(['say "hi"', "a,b", "back\\slash"]),
+            '{"say \\\\"hi\\\\"","a,b","back\\\\\\\\slash"}'
+        )
+        
+    def test_empty_array(self):
+        self.assertEqual(_copy_text_value([]), "{}")
+        
+    def test_jsonb_values_are_json(self):
+        self.assertEqual(_copy_text_value([1, 2], is_json=True), "[1, 2]")
+        self.assertEqual(_copy_text_value({"k": "v"}, is_json=True), '{"k": "v"}')
+        self.assertEqual(_copy_text_value("text", is_json=True), '"text"')
+        self.assertEqual(_copy_text_value(None, is_json=True), "\\N")
+        
+    def test_jsonb_escapes_copy_specials(self):
+        encoded = _copy_text_value({"note": "line1\nline2"}, is_json=True)
+        self.assertNotIn("\n", encoded)
+        self.assertEqual(json.loads(encoded.replace("\\\\", "\\")), {"note": "line1\nline2"})
+        
+    def test_row_with_array_and_jsonb_columns(self):
+        row = (7, [1, 2], ["x,y"], [1, 2])
+        self.assertEqual(
+            _copy_text_line(row, (False, False, False, True)),
+            '7\t{"1","2"}\t{"x,y"}\t[1, 2]\n'
+        )
+        
+    def test_ranges_use_range_literals(self):
+        self.assertEqual(_copy_text_value(NumericRange(1, 5, "[)")), '["1","5")')
+        self.assertEqual(_copy_text_value(NumericRange(None, 5, "(]")), '(,"5"]')
+        self.assertEqual(_copy_text_value(NumericRange(empty=True)), "empty")
+        self.assertEqual(_copy_text_value(DateRange(datetime.date(2024, 1, 1), None)), '["2024-01-01",)')
+        
+    def test_array_of_ranges(self):
+        # Range quotes are escaped inside the array element, then COPY doubles the backslashes
+        self.assertEqual(_copy_text_value([NumericRange(1, 2)]), '{"[\\\\"1\\\\",\\\\"2\\\\")"}')
+        
+    def test_interval(self):
+        self.assertEqual(
+            _copy_text_value(datetime.timedelta(days=-1, seconds=5, microseconds=7)),
+            "-1 days 5 seconds 7 microseconds"
+        )
+        
+    def test_copy_buffer_uses_json_columns(self):
+        buf = _rows_to_copy_buffer([(1, {"a": [1]}), (2, None)], (False, True))
+        self.assertEqual(buf.getvalue(), '1\t{"a": [1]}\n2\t\\N\n')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+"""
+Tests for the MongoDB batch write paths: per-partition bulk writes to RU targets and
+the insert-only duplicate-key fallback.
+"""
+
+import os
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pymongo import InsertOne, ReplaceOne
+from pymongo.errors import BulkWriteError, ConnectionFailure
+from pymongo.results import BulkWriteResult
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from migration_service import MigrationService
+
+
+class _Config:
+    target_is_vcore = False
+    migration_workers = 4
+
+
+class _FakeCollection:
+    """Destination collection whose bulk_write outcome is decided per document _id.
+    
+    Operations passed to bulk_write are the documents themselves, except in the
+    _process_batch tests where real InsertOne/ReplaceOne operations are used.
+    """
+    
+    def __init__(self, existing_ids=(), rejected_ids=(), broken_ids=()):
+        self.existing_ids = set(existing_ids)  # Inserts of these fail with a duplicate key
+        self.rejected_ids = set(rejected_ids)  # Writes of these fail with a validation error
+        self.broken_ids = set(broken_ids)  # A bulk write containing any of these fails outright
+        self.calls = []
+        self._lock = threading.Lock()
+        
+    def bulk_write(self, operations, ordered=False):
+        with self._lock:
+            self.calls.append(list(operations))
+            
+        ids = [self._op_id(op) for op in operations]
+        if self.broken_ids.intersection(ids):
+            raise ConnectionFailure("connection reset by peer")
+            
+        details = {"nInserted": 0, "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0,
+                   "upserted": [], "writeErrors": [], "writeConcernErrors": []}
+        for index, (op, doc_id) in enumerate(zip(operations, ids)):
+            if doc_id in self.rejected_ids:
+                details["writeErrors"].append({"index": index, "code": 121, "errmsg": "validation failed", "op": {"_id": doc_id}})
+            elif isinstance(op, ReplaceOne):
+                if doc_id in self.existing_ids:
+                    details["nMatched"] += 1
+                    details["nModified"] += 1
+                else:
+                    details["nUpserted"] += 1
+                    details["upserted"].append({"index": index, "_id": doc_id})
+            elif doc_id in self.existing_ids:
+                details["writeErrors"].append({"index": index, "code": 11000, "errmsg": "E11000 duplicate key", "op": {"_id": doc_id}})
+            else:
+                details["nInserted"] += 1
+                
+        if details["writeErrors"]:
+            raise BulkWriteError(details)
+        return BulkWriteResult(details, True)
+        
+    @staticmethod
+    def _op_id(op):
+        if isinstance(op, InsertOne):
+            return op._doc["_id"]
+        if isinstance(op, ReplaceOne):
+            return op._filter["_id"]
+        return op["_id"]
+
+
+def _make_service(target_is_vcore=False):
+    """Build a MigrationService without its constructor, which probes the target account."""
+    service = MigrationService.__new__(MigrationService)
+    service.config = _Config()
+    service.config.target_is_vcore = target_is_vcore
+    service.connection_manager = None
+    service.cancel_event = threading.Event()
+    service.ru_write_partitions = 16
+    service._ru_write_executor = ThreadPoolExecutor(max_workers=4)
+    return service
+
+
+class BulkWritePartitionedTests(unittest.TestCase):
+    """Per-bucket results must be merged back with indexes that refer to the whole batch."""
+    
+    def setUp(self):
+        self.service = _make_service()
+        self.batch = [{"_id": i} for i in range(64)]
+        
+    def tearDown(self):
+        self.service._ru_write_executor.shutdown(wait=True)
+        
+    def _bucket_of(self, doc_id):
+        return hash(str(doc_id)) & (self.service.ru_write_partitions - 1)
+        
+    def test_all_buckets_succeed(self):
+        collection = _FakeCollection()
+        result = self.service._bulk_write_partitioned(collection, self.batch, self.batch)
+        
+        self.assertEqual(result.inserted_count, 64)
+        self.assertGreater(len(collection.calls), 1)
+        self.assertEqual(sorted(op["_id"] for call in collection.calls for op in call), list(range(64)))
+        
+    def test_write_error_indexes_refer_to_batch(self):
+        collection = _FakeCollection(rejected_ids={5, 40, 63})
+        with self.assertRaises(BulkWriteError) as ctx:
+            self.service._bulk_write_partitioned(collection, self.batch, self.batch)
+            
+        details = ctx.exception.details
+        self.assertEqual(details["nInserted"], 61)
+        self.assertEqual(sorted(error["index"] for error in details["writeErrors"]), [5, 40, 63])
+        for error in details["writeErrors"]:
+            self.assertEqual(self.batch[error["index"]]["_id"], error["op"]["_id"])
+            
+    def test_upserted_indexes_refer_to_batch(self):
+        operations = [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in self.batch]
+        result = self.service._bulk_write_partitioned(_FakeCollection(), operations, self.batch)
+        
+        self.assertEqual(result.upserted_count, 64)
+        self.assertEqual(result.upserted_ids, {i: i for i in range(64)})
+        
+    def test_failed_bucket_is_reported_with_committed_counts(self):
+        broken_bucket = self._bucket_of(0)
+        lost = [doc["_id"] for doc in self.batch if self._bucket_of(doc["_id"]) == broken_bucket]
+        collection = _FakeCollection(broken_ids={0})
+        
+        with self.assertRaises(BulkWriteError) as ctx:
+            self.service._bulk_write_partitioned(collection, self.batch, self.batch)
+            
+        details = ctx.exception.details
+        self.assertEqual(details["nInserted"], 64 - len(lost))
+        self.assertEqual(sorted(error["index"] for error in details["writeErrors"]), lost)
+        self.assertTrue(all(error["code"] is None for error in details["writeErrors"]))
+        
+    def test_all_buckets_failing_reraises_for_retry(self):
+        collection = _FakeCollection(broken_ids=set(range(64)))
+        with self.assertRaises(ConnectionFailure):
+            self.service._bulk_write_partitioned(collection, self.batch, self.batch)
+            
+    def test_single_bucket_writes_directly(self):
+        self.service.ru_write_partitions = 1
+        collection = _FakeCollection()
+        result = self.service._bulk_write_partitioned(collection, self.batch, self.batch)
+        
+        self.assertEqual(result.inserted_count, 64)
+        self.assertEqual(len(collection.calls), 1)
+        
+    def test_process_batch_counts_partial_partition_failure(self):
+        broken_bucket = self._bucket_of(0)
+        lost = sum(1 for doc in self.batch if self._bucket_of(doc["_id"]) == broken_bucket)
+        collection = _FakeCollection(broken_ids={0})
+        
+        with self.assertLogs("migration_service", level="ERROR"):
+            stats = self.service._process_batch(collection, self.batch)
+            
+        self.assertEqual(stats["inserted"], 64 - lost)
+        self.assertEqual(stats["failed"], lost)
+
+
+class InsertOnlyFallbackTests(unittest.TestCase):
+    """Insert-only batches that hit existing documents must upsert those documents instead."""
+    
+    def setUp(self):
+        self.service = _make_service(target_is_vcore=True)
+        self.batch = [{"_id": i, "value": i} for i in range(10)]
+        
+    def tearDown(self):
+        self.service._ru_write_executor.shutdown(wait=True)
+        
+    def test_fresh_destination_is_inserted(self):
+        collection = _FakeCollection()
+        stats = self.service._process_batch(collection, self.batch, insert_only=True)
+        
+        self.assertEqual(stats["inserted"], 10)
+        self.assertEqual(stats["failed"], 0)
+        self.assertNotIn("duplicate_keys", stats)
+        self.assertEqual(len(collection.calls), 1)
+        
+    def test_duplicates_are_retried_as_upserts(self):
+        collection = _FakeCollection(existing_ids={2, 7})
+        stats = self.service._process_batch(collection, self.batch, insert_only=True)
+        
+        self.assertEqual(stats["inserted"], 10)
+        self.assertEqual(stats["raw_inserted"], 8)
+        self.assertEqual(stats["modified"], 2)
+        self.assertEqual(stats["failed"], 0)
+        self.assertIs(stats["duplicate_keys"], True)
+        
+        self.assertEqual(len(collection.calls), 2)
+        retried = collection.calls[1]
+        self.assertTrue(all(isinstance(op, ReplaceOne) for op in retried))
+        self.assertEqual(sorted(op._filter["_id"] for op in retried), [2, 7])
+        
+    def test_other_write_errors_are_not_retried(self):
+        collection = _FakeCollection(existing_ids={2}, rejected_ids={4})
+        with self.assertLogs("migration_service", level="ERROR"):
+            stats = self.service._process_batch(collection, self.batch, insert_only=True)
+            
+        self.assertEqual(stats["inserted"], 9)
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual([op._filter["_id"] for op in collection.calls[1]], [2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Tests for the PostgreSQL retry backoff and the GUI connection-field helpers.
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gui import CosmosDBMigrationGUI
+from postgresql_connection_manager import _MAX_RETRY_DELAY_SECONDS, _decorrelated_jitter
+
+
+class DecorrelatedJitterTests(unittest.TestCase):
+    """Retry delays stay between the base delay and the cap, growing at most threefold."""
+    
+    def setUp(self):
+        random.seed(1234)
+        
+    def test_first_retry_is_at_most_three_times_base(self):
+        delays = [_decorrelated_jitter(0.5, 0.5) for _ in range(200)]
+        self.assertTrue(all(0.5 <= delay <= 1.5 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+        
+    def test_delay_bounds(self):
+        for prev_delay in (0.0, 0.1, 0.5, 2.0, 9.0, 25.0, 1000.0):
+            for _ in range(200):
+                delay = _decorrelated_jitter(0.5, prev_delay)
+                self.assertGreaterEqual(delay, 0.5)
+                self.assertLessEqual(delay, min(_MAX_RETRY_DELAY_SECONDS, max(0.5, prev_delay * 3)))
+                
+    def test_custom_cap(self):
+        for _ in range(200):
+            self.assertLessEqual(_decorrelated_jitter(1.0, 100.0, cap=5.0), 5.0)
+            
+    def test_chained_delays_stay_capped(self):
+        delay = 1.0
+        for _ in range(50):
+            delay = _decorrelated_jitter(1.0, delay)
+            self.assertGreaterEqual(delay, 1.0)
+            self.assertLessEqual(delay, _MAX_RETRY_DELAY_SECONDS)
+
+
+class BuildConnectionStringTests(unittest.TestCase):
+    """build_postgresql_connection_string turns the GUI fields into a libpq DSN."""
+    
+    build = staticmethod(CosmosDBMigrationGUI.build_postgresql_connection_string)
+    
+    def test_plain_host_gets_default_port(self):
+        dsn, masked = self.build("db.example.com", "sales", "admin", "secret")
+        self.assertEqual(dsn, "host=db.example.com port=5432 dbname=sales user=admin password=secret")
+        self.assertEqual(masked, "host=db.example.com port=5432 dbname=sales user=admin password=******")
+        
+    def test_url_prefix_port_and_azure_ssl(self):
+        dsn, _ = self.build("postgresql://srv.postgres.database.azure.com:6432/", "sales", "admin", "secret")
+        self.assertEqual(
+            dsn,
+            "host=srv.postgres.database.azure.com port=6432 dbname=sales user=admin password=secret sslmode=require"
+        )
+        
+    def test_ipv6_host(self):
+        dsn, _ = self.build("[::1]:5433", "sales", "admin", "secret")
+        self.assertTrue(dsn.startswith("host=::1 port=5433 "))
+        dsn, _ = self.build("[::1]", "sales", "admin", "secret")
+        self.assertTrue(dsn.startswith("host=::1 port=5432 "))
+        
+    def test_special_characters_are_quoted(self):
+        dsn, masked = self.build("db.example.com", "sales", "app user", "p'a\\ss word")
+        self.assertIn("user='app user'", dsn)
+        self.assertIn("password='p\\'a\\\\ss word'", dsn)
+        self.assertNotIn("p'a", masked)
+        
+    def test_missing_field_raises(self):
+        with self.assertRaises(ValueError):
+            self.build("db.example.com", "sales", "admin", "")
+            
+    def test_invalid_port_raises(self):
+        with self.assertRaises(ValueError):
+            self.build("db.example.com:pg", "sales", "admin", "secret")
+
+
+class ValidateConnectionFieldsTests(unittest.TestCase):
+    """validate_postgresql_connection_fields reports every bad field at once."""
+    
+    validate = staticmethod(CosmosDBMigrationGUI.validate_postgresql_connection_fields)
+    
+    def test_valid_fields(self):
+        self.assertEqual(self.validate("postgres://db.example.com:5432", "sales_2024", "admin", "secret"), [])
+        
+    def test_required_fields(self):
+        self.assertEqual(
+            self.validate("", "", "", ""),
+            ["Server URL is required", "Database name is required", "Username is required", "Password is required"]
+        )
+        
+    def test_invalid_characters(self):
+        self.assertEqual(
+            self.validate("db example.com", "sales;drop", "admin", "secret"),
+            ["Server URL contains invalid characters", "Database name contains invalid characters"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()